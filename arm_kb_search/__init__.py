@@ -12,7 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .loaders import load_metadata, load_usearch_index
+from .batching import BatchedEmbeddingModel
+from .embedding_cache import DiskEmbeddingCache, open_embedding_cache
+from .loaders import (
+    build_search_text,
+    load_bm25_index,
+    load_metadata,
+    load_popular_queries,
+    load_query_projection,
+    load_usearch_index,
+    map_usearch_index,
+    save_bm25_index,
+)
 from .evaluation import (
     EvaluationCaseResult,
     EvaluationResult,
@@ -25,22 +36,34 @@ from .evaluation import (
 from .search import (
     build_bm25_index,
     bm25_search,
+    clear_query_embedding_cache,
     deduplicate_urls,
     deduplication_candidate_count,
     embedding_search,
+    encode_queries,
+    encode_query,
+    forward_encode,
     hybrid_search,
     lexical_prepass_search,
+    normalize_query,
+    project_query,
     rerank_candidates,
     salient_tokens,
     tokenize_for_search,
 )
 from .resources import (
     SearchResources,
+    configure_inference_threads,
+    detect_embedding_device,
+    embedding_backend_kwargs,
     embedding_dimension,
     load_embedding_model,
     load_search_resources,
     search,
+    search_batch,
     sentence_transformer_cache_folder,
+    use_half_precision,
+    warm_up_search_resources,
 )
 from .response import (
     ARM_CONTENT_DISCLAIMER,
@@ -49,36 +72,59 @@ from .response import (
     add_utm_source_to_url,
     is_arm_domain_url,
 )
+from .semantic_cache import SemanticResultCache
 
 __all__ = [
+    "BatchedEmbeddingModel",
     "add_disclaimer_to_arm_results",
     "add_utm_source_to_results",
     "add_utm_source_to_url",
     "ARM_CONTENT_DISCLAIMER",
     "build_bm25_index",
+    "build_search_text",
+    "clear_query_embedding_cache",
+    "configure_inference_threads",
     "bm25_search",
     "deduplicate_urls",
+    "DiskEmbeddingCache",
     "deduplication_candidate_count",
+    "detect_embedding_device",
     "embedding_search",
+    "embedding_backend_kwargs",
     "embedding_dimension",
+    "encode_queries",
+    "encode_query",
     "evaluate_retrieval",
     "EvaluationCaseResult",
     "EvaluationResult",
+    "forward_encode",
     "hybrid_search",
     "is_arm_domain_url",
     "lexical_prepass_search",
+    "load_bm25_index",
     "load_embedding_model",
     "load_eval_rows",
     "load_metadata",
+    "load_popular_queries",
+    "load_query_projection",
     "load_search_resources",
     "load_usearch_index",
+    "map_usearch_index",
+    "normalize_query",
+    "project_query",
+    "open_embedding_cache",
     "print_evaluation",
     "rerank_candidates",
     "RetrievalError",
     "RetrievalMiss",
     "salient_tokens",
+    "save_bm25_index",
     "search",
+    "search_batch",
     "SearchResources",
+    "SemanticResultCache",
     "sentence_transformer_cache_folder",
     "tokenize_for_search",
+    "use_half_precision",
+    "warm_up_search_resources",
 ]
@@ -0,0 +1,80 @@
+# Copyright © 2025, Arm Limited and Contributors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+import numpy as np
+from .config import ENCODE_BATCH_MAX_SIZE
+from .search import forward_encode
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+class BatchedEmbeddingModel:
+    """Coalesce concurrent single-query encodes into one forward pass.
+
+    Callers block for at most `window_ms` while other threads' queries join the batch. Anything
+    other than a plain one-sentence encode is passed straight to the wrapped model.
+    """
+
+    def __init__(self, model: SentenceTransformer, window_ms: float, max_batch_size: int = ENCODE_BATCH_MAX_SIZE):
+        self.model = model
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
+    def encode(self, sentences: Any, **kwargs: Any) -> Any:
+        if kwargs or not isinstance(sentences, list) or len(sentences) != 1:
+            return self.model.encode(sentences, **kwargs)
+        future: Future = Future()
+        self._queue.put((sentences[0], future))
+        return future.result()[np.newaxis, :]
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        unique_queries = list(dict.fromkeys(query for query, _ in batch))
+        try:
+            embeddings = forward_encode(self.model, unique_queries)
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        rows = dict(zip(unique_queries, embeddings))
+        for query, future in batch:
+            future.set_result(rows[query])
@@ -14,3 +14,15 @@
 
 DISTANCE_THRESHOLD = 1.1
 K_RESULTS = 5
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+# Recent queries kept for semantic (near-duplicate) result reuse, when enabled.
+SEMANTIC_CACHE_SIZE = 1024
+QUERY_EMBEDDING_DISK_CACHE_ENTRIES = 50_000
+# Unit vectors quantize to int8 with the same scale the i8 USearch index uses: 4x smaller than float32.
+QUERY_EMBEDDING_DISK_CACHE_DTYPE = "int8"
+# Query encodes are single short sequences; wide intra-op pools mostly add synchronization.
+EMBEDDING_NUM_THREADS = 4
+# Upper bound on queries coalesced into one forward pass when encode batching is enabled.
+ENCODE_BATCH_MAX_SIZE = 8
+# Batch size for multi-query searches that embed their uncached queries in one encode call.
+QUERY_ENCODE_BATCH_SIZE = 32
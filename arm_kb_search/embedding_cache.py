@@ -0,0 +1,116 @@
+# Copyright © 2025, Arm Limited and Contributors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from typing import Optional
+
+import numpy as np
+
+from .config import QUERY_EMBEDDING_DISK_CACHE_DTYPE, QUERY_EMBEDDING_DISK_CACHE_ENTRIES
+
+
+INT8_SCALE = 127.0
+
+
+class DiskEmbeddingCache:
+    """SQLite-backed LRU cache of query embeddings that survives process restarts."""
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int = QUERY_EMBEDDING_DISK_CACHE_ENTRIES,
+        dtype: str = QUERY_EMBEDDING_DISK_CACHE_DTYPE,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Tools run on worker threads, so share one connection behind a lock.
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings ("
+            "key BLOB PRIMARY KEY, dtype TEXT NOT NULL, vector BLOB NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS query_embeddings_last_used ON query_embeddings(last_used)"
+        )
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM query_embeddings"
+        ).fetchone()[0]
+
+    def _key(self, query: str) -> bytes:
+        return hashlib.blake2b(f"{self.namespace}\x00{query}".encode("utf-8"), digest_size=16).digest()
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        key = self._key(query)
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT dtype, vector FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._clock += 1
+                self._connection.execute(
+                    "UPDATE query_embeddings SET last_used = ? WHERE key = ?", (self._clock, key)
+                )
+            except sqlite3.Error:
+                # A broken cache must never fail a search; treat it as a miss.
+                return None
+        dtype, vector = row
+        embedding = np.frombuffer(vector, dtype=dtype).astype(np.float32)
+        if np.dtype(dtype).kind == "i":
+            # Undo the int8 quantization and restore unit length for inner-product indexes.
+            embedding /= np.linalg.norm(embedding) or 1.0
+        return embedding
+
+    def put(self, query: str, embedding: np.ndarray) -> None:
+        if self.dtype.kind == "i":
+            embedding = np.clip(np.round(np.asarray(embedding) * INT8_SCALE), -128, 127)
+        vector = np.ascontiguousarray(embedding, dtype=self.dtype).tobytes()
+        with self._lock:
+            self._clock += 1
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, dtype, vector, last_used) VALUES (?, ?, ?, ?)",
+                    (self._key(query), self.dtype.str, vector, self._clock),
+                )
+                # Entries untouched for max_entries cache operations are the least recently used.
+                self._connection.execute(
+                    "DELETE FROM query_embeddings WHERE last_used <= ?", (self._clock - self.max_entries,)
+                )
+            except sqlite3.Error:
+                pass
+
+
+def open_embedding_cache(path: Optional[str], namespace: str) -> Optional[DiskEmbeddingCache]:
+    """Open the on-disk query embedding cache, or return None when disabled or unavailable."""
+    if not path:
+        return None
+    try:
+        return DiskEmbeddingCache(path, namespace)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Error: Could not open query embedding cache '{path}': {exc}", file=sys.stderr)
+        return None
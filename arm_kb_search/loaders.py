@@ -12,37 +12,181 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+import mmap
 import os
+import pickle
+import sys
 
+import numpy as np
+import orjson
+from rank_bm25 import BM25Okapi
 from usearch.index import Index
 
 
-def load_usearch_index(index_path: str, dimension: int) -> Optional[Index]:
-    """Load USearch index from file."""
+INDEX_MANIFEST_FILENAME = "manifest.json"
+BM25_INDEX_FORMAT_VERSION = 1
+# Keep in sync with embedding-generation/local_vectorstore_creation.py.
+USEARCH_EXPANSION_SEARCH = 64
+
+
+def load_index_manifest(index_path: str) -> Dict:
+    """Load the build manifest stored next to the USearch index, if present."""
+    manifest_path = os.path.join(os.path.dirname(index_path), INDEX_MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as file:
+        return json.load(file)
+
+
+def map_usearch_index(index_path: str) -> Optional[mmap.mmap]:
+    """Memory-map an index file with kernel readahead off, when USEARCH_MADV_RANDOM asks for it.
+
+    HNSW traversal touches scattered graph nodes, so readahead on a cold page cache mostly reads
+    pages no search needs. Returns None when the option is off, unsupported or the file is missing;
+    the caller owns the mapping and must keep it open for as long as the index viewing it.
+    """
+    view = os.getenv("USEARCH_VIEW", "1").strip().lower() in {"1", "true", "yes", "on"}
+    madvise_random = os.getenv("USEARCH_MADV_RANDOM", "0").strip().lower() in {"1", "true", "yes", "on"}
+    if not (view and madvise_random and hasattr(mmap, "MADV_RANDOM")) or not os.path.exists(index_path):
+        return None
+    with open(index_path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    mapped.madvise(mmap.MADV_RANDOM)
+    return mapped
+
+
+def load_usearch_index(index_path: str, dimension: int, mapped_file: Optional[mmap.mmap] = None) -> Optional[Index]:
+    """Load USearch index from file, or view it through `mapped_file` (see map_usearch_index)."""
     if not os.path.exists(index_path):
-        print(f"Error: USearch index file '{index_path}' does not exist.")
+        print(f"Error: USearch index file '{index_path}' does not exist.", file=sys.stderr)
         return None
     if dimension <= 0:
-        print("Error: Invalid embedding dimension.")
-        return None
-    index = Index(
-        ndim=dimension,
-        metric="l2sq",
-        dtype="f32",
-        connectivity=16,
-        expansion_add=128,
-        expansion_search=64,
-    )
-    index.load(index_path)
+        print("Error: Invalid embedding dimension.", file=sys.stderr)
+        return None
+    try:
+        # The header records ndim, scalar type and metric, so the index restores without a manifest.
+        header = Index.metadata(index_path)
+    except ValueError as e:
+        print(f"Error: Failed to read USearch index '{index_path}': {e}", file=sys.stderr)
+        return None
+    if int(header["dimensions"]) != dimension:
+        print(f"Error: USearch index dimension {header['dimensions']} does not match embedding dimension {dimension}.", file=sys.stderr)
+        return None
+    # By default, memory-map the index read-only instead of copying it into RAM. Startup no longer
+    # scales with index size, resident memory is only the touched working set, and server processes
+    # on one host share the mapped pages through the page cache; cold searches page graph nodes in
+    # from disk. Search never mutates the index, so a view is sufficient; set USEARCH_VIEW=0 for a
+    # private in-RAM copy (e.g. if the index must be modified).
+    if mapped_file is not None:
+        # USearch does not hold a reference to the buffer it views; the caller keeps it alive.
+        index = Index.restore(mapped_file, view=True)
+    else:
+        view = os.getenv("USEARCH_VIEW", "1").strip().lower() in {"1", "true", "yes", "on"}
+        index = Index.restore(index_path, view=view)
+    # Search-time beam width is not stored in the file.
+    index.expansion_search = USEARCH_EXPANSION_SEARCH
     return index
 
 
+def load_query_projection(index_path: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Load the (mean, projection) PCA pair an index was reduced with, if the manifest names one."""
+    projection_file = load_index_manifest(index_path).get("projection_file")
+    if not projection_file:
+        return None
+    projection_path = os.path.join(os.path.dirname(index_path), projection_file)
+    if not os.path.exists(projection_path):
+        print(f"Error: PCA projection '{projection_path}' does not exist.", file=sys.stderr)
+        return None
+    with np.load(projection_path) as projection:
+        return projection["mean"].astype(np.float32), projection["projection"].astype(np.float32)
+
+
+def build_search_text(item: Dict) -> str:
+    """Rebuild the lexical search text that older metadata files stored inline."""
+    return " ".join(
+        str(value)
+        for value in (
+            item.get("title", ""),
+            " ".join(item.get("heading_path") or []),
+            item.get("heading", ""),
+            item.get("doc_type", ""),
+            item.get("product", ""),
+            item.get("version", ""),
+            item.get("keywords", ""),
+            item.get("original_text", item.get("content", "")),
+        )
+        if value
+    )
+
+
 def load_metadata(metadata_path: str) -> List[Dict]:
     """Load metadata from JSON file."""
     if not os.path.exists(metadata_path):
-        print(f"Error: Metadata file '{metadata_path}' does not exist.")
+        print(f"Error: Metadata file '{metadata_path}' does not exist.", file=sys.stderr)
         return []
-    with open(metadata_path, "r") as file:
-        return json.load(file)
+    with open(metadata_path, "rb") as file:
+        metadata = orjson.loads(file.read())
+    for item in metadata:
+        if "search_text" not in item:
+            item["search_text"] = build_search_text(item)
+    return metadata
+
+
+def load_popular_queries(popular_queries_path: Optional[str]) -> Dict[str, List[Dict]]:
+    """Load prebaked search results from an optional JSON file.
+
+    The file is an object mapping each query string to the list of result objects to return
+    for it. Keys are lowercased and whitespace-collapsed on load. A file of any other shape is
+    reported and ignored so that a bad file never breaks searches.
+    """
+    if not popular_queries_path or not os.path.exists(popular_queries_path):
+        return {}
+    try:
+        with open(popular_queries_path, "rb") as file:
+            popular = orjson.loads(file.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"Error: Failed to load popular queries '{popular_queries_path}': {e}", file=sys.stderr)
+        return {}
+    if not isinstance(popular, dict) or not all(
+        isinstance(query, str)
+        and isinstance(results, list)
+        and all(isinstance(result, dict) for result in results)
+        for query, results in popular.items()
+    ):
+        print(
+            f"Error: Popular queries '{popular_queries_path}' must map query strings to lists of result objects.",
+            file=sys.stderr,
+        )
+        return {}
+    normalized = ((" ".join(query.lower().split()), results) for query, results in popular.items())
+    return {query: results for query, results in normalized if query}
+
+
+def save_bm25_index(bm25_index: Optional[BM25Okapi], bm25_path: str) -> None:
+    """Pickle a prebuilt BM25 index so servers can skip tokenizing the corpus at startup."""
+    if bm25_index is None:
+        return
+    with open(bm25_path, "wb") as file:
+        pickle.dump(
+            {"version": BM25_INDEX_FORMAT_VERSION, "corpus_size": bm25_index.corpus_size, "bm25": bm25_index},
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+
+def load_bm25_index(bm25_path: Optional[str], metadata: List[Dict]) -> Optional[BM25Okapi]:
+    """Load a prebuilt BM25 index, or return None if it is missing or does not match the metadata."""
+    if not bm25_path or not os.path.exists(bm25_path):
+        return None
+    try:
+        with open(bm25_path, "rb") as file:
+            payload = pickle.load(file)
+    except Exception as exc:
+        print(f"Error: Could not load BM25 index '{bm25_path}': {exc}", file=sys.stderr)
+        return None
+    if payload.get("version") != BM25_INDEX_FORMAT_VERSION or payload.get("corpus_size") != len(metadata):
+        print(f"Error: BM25 index '{bm25_path}' does not match the metadata; ignoring it.", file=sys.stderr)
+        return None
+    return payload["bm25"]
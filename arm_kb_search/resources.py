@@ -12,18 +12,51 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import mmap
 import os
-from typing import Any
+import platform
+import sys
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from rank_bm25 import BM25Okapi
-from sentence_transformers import SentenceTransformer
 from usearch.index import Index
 
-from .config import K_RESULTS
-from .loaders import load_metadata, load_usearch_index
+from .batching import BatchedEmbeddingModel
+from .config import EMBEDDING_NUM_THREADS, K_RESULTS
+from .embedding_cache import DiskEmbeddingCache, open_embedding_cache
+from .loaders import (
+    load_bm25_index,
+    load_index_manifest,
+    load_metadata,
+    load_query_projection,
+    load_usearch_index,
+    map_usearch_index,
+)
 from .response import add_disclaimer_to_arm_results, add_utm_source_to_results
-from .search import build_bm25_index, deduplicate_urls, deduplication_candidate_count, hybrid_search
+from .search import (
+    build_bm25_index,
+    deduplication_candidate_count,
+    encode_queries,
+    encode_query,
+    forward_encode,
+    hybrid_search,
+    normalize_query,
+    project_query,
+)
+from .semantic_cache import SemanticResultCache
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+ONNX_QINT8_ARM64_FILE = "onnx/model_qint8_arm64.onnx"
+ONNX_QINT8_X86_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+ONNX_O4_FILE = "onnx/model_O4.onnx"
+OPENVINO_QINT8_FILE = "openvino/openvino_model_qint8_quantized.xml"
 
 
 @dataclass
@@ -35,6 +68,38 @@ class SearchResources:
     default_k: int = K_RESULTS
     include_disclaimers: bool = True
     utm_source: str | None = None
+    query_embedding_cache: DiskEmbeddingCache | None = None
+    # (mean, projection) when the index stores PCA-reduced vectors; queries are projected to match.
+    query_projection: tuple[np.ndarray, np.ndarray] | None = None
+    semantic_cache: SemanticResultCache | None = None
+    # Memory map the index views when USEARCH_MADV_RANDOM is set; held here to keep it open.
+    usearch_index_mapping: mmap.mmap | None = None
+    # Per-row (url, snippet, title, heading, doc_type, product), indexed like metadata.
+    result_fields: list[tuple[Any, ...]] = field(init=False, repr=False)
+
+    # Per-row integer id of the row's URL (-1 when it has none), for vectorized deduplication.
+    url_ids: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.result_fields = [_result_fields_for(item) for item in self.metadata]
+        url_index: dict[str, int] = {}
+        self.url_ids = np.fromiter(
+            (url_index.setdefault(fields[0], len(url_index)) if fields[0] else -1 for fields in self.result_fields),
+            dtype=np.int64,
+            count=len(self.result_fields),
+        )
+
+
+def _result_fields_for(metadata: dict[str, Any]) -> tuple[Any, ...]:
+    """Extract the (url, snippet, title, heading, doc_type, product) fields search results expose."""
+    return (
+        metadata.get("url"),
+        metadata.get("original_text", metadata.get("content", "")),
+        metadata.get("title", ""),
+        metadata.get("heading", ""),
+        metadata.get("doc_type", ""),
+        metadata.get("product", ""),
+    )
 
 
 def sentence_transformer_cache_folder() -> str | None:
@@ -47,32 +112,190 @@ def embedding_dimension(embedding_model: SentenceTransformer) -> int:
     return int(embedding_model.get_sentence_embedding_dimension())
 
 
+def embedding_backend_kwargs(device: str = "cpu") -> dict[str, Any]:
+    """SentenceTransformer backend options selected with EMBEDDING_BACKEND (torch by default)."""
+    backend = os.getenv("EMBEDDING_BACKEND", "torch").strip().lower()
+    if backend == "openvino":
+        # OpenVINO's int8 kernels target Intel CPUs (VNNI/AMX); requires the
+        # sentence-transformers[openvino] extra. Other platforms keep the torch backend.
+        if device != "cpu" or platform.machine().lower() not in {"x86_64", "amd64"}:
+            return {}
+        return {
+            "backend": "openvino",
+            "model_kwargs": {"file_name": os.getenv("EMBEDDING_OPENVINO_FILE") or OPENVINO_QINT8_FILE},
+        }
+    if backend != "onnx":
+        return {}
+    # Exports shipped with the model on the Hub; requires the sentence-transformers[onnx] extra.
+    # On CPU use the dynamically quantized int8 graph for this architecture. On CUDA use the
+    # O4 graph (fused kernels plus fp16), which ONNX Runtime only supports on GPU.
+    # EMBEDDING_ONNX_FILE selects a different export, e.g. onnx/model_O3.onnx.
+    if device == "cuda":
+        default_file = ONNX_O4_FILE
+    elif platform.machine().lower() in {"arm64", "aarch64"}:
+        default_file = ONNX_QINT8_ARM64_FILE
+    else:
+        default_file = ONNX_QINT8_X86_FILE
+    return {
+        "backend": "onnx",
+        "model_kwargs": {"file_name": os.getenv("EMBEDDING_ONNX_FILE") or default_file},
+    }
+
+
+def onnx_session_options() -> Any:
+    """ONNX Runtime options for the single process-wide session the model creates at load."""
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    # Optimize the graph once at session creation rather than relying on the export's level.
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = inference_thread_count()
+    options.inter_op_num_threads = 1
+    options.add_session_config_entry("session.use_deterministic_compute", "0")
+    return options
+
+
+def detect_embedding_device() -> str:
+    """Pick CUDA, then Apple MPS, then CPU; EMBEDDING_DEVICE forces a device."""
+    override = os.getenv("EMBEDDING_DEVICE")
+    if override:
+        return override
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            return "cuda"
+        if torch.backends.mps.is_available():
+            return "mps"
+    except Exception:
+        pass
+    return "cpu"
+
+
+def available_cpu_count() -> int:
+    """CPUs this process may run on, which in a container can be far fewer than the host's."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def inference_thread_count() -> int:
+    return max(1, int(os.getenv("EMBEDDING_NUM_THREADS") or min(EMBEDDING_NUM_THREADS, available_cpu_count())))
+
+
+def configure_inference_threads() -> None:
+    """Size torch's thread pools for one-query-at-a-time encodes; EMBEDDING_NUM_THREADS overrides."""
+    import torch
+
+    torch.set_num_threads(inference_thread_count())
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable once and before any inter-op work has started.
+        pass
+
+
+def embedding_cache_namespace(model_name: str) -> str:
+    """Key cached embeddings by model and backend, since quantized backends give different vectors."""
+    device = detect_embedding_device()
+    model_kwargs = embedding_backend_kwargs(device).get("model_kwargs", {})
+    if "file_name" in model_kwargs:
+        return f"{model_name}:{model_kwargs['file_name']}"
+    return f"{model_name}:bf16" if device == "cpu" and use_cpu_bf16() else model_name
+
+
+def check_fast_tokenizer(model: SentenceTransformer) -> None:
+    """Warn when the model fell back to a pure-Python tokenizer, which dominates short-query encodes."""
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is not None and not getattr(tokenizer, "is_fast", True):
+        print(f"Warning: embedding model is using the slow tokenizer {type(tokenizer).__name__}; install 'tokenizers'.", file=sys.stderr)
+
+
+def use_cpu_bf16() -> bool:
+    """EMBEDDING_CPU_BF16 opts into bf16 weights on CPUs with native bf16 (Neoverse V1/V2, Sapphire Rapids)."""
+    return os.getenv("EMBEDDING_CPU_BF16", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def use_half_precision(model: SentenceTransformer, device: str) -> SentenceTransformer:
+    """Cast torch weights to fp16 on accelerators (or bf16 on opted-in CPUs), keeping fp32 on failure."""
+    if embedding_backend_kwargs(device):
+        return model
+    try:
+        if device in {"cuda", "mps"}:
+            return model.half()
+        if device == "cpu" and use_cpu_bf16():
+            import torch
+
+            # Embeddings are upcast and normalized in fp32 by the search helpers.
+            return model.to(torch.bfloat16)
+    except Exception as exc:
+        print(f"Keeping fp32 weights for the embedding model on {device}: {exc}", file=sys.stderr)
+    return model
+
+
+def use_torch_compile(model: SentenceTransformer, device: str) -> SentenceTransformer:
+    """Compile the torch forward pass when EMBEDDING_TORCH_COMPILE is set, running eagerly if that fails."""
+    if embedding_backend_kwargs(device):
+        return model
+    if os.getenv("EMBEDDING_TORCH_COMPILE", "0").strip().lower() not in {"1", "true", "yes", "on"}:
+        return model
+    import torch
+
+    # Dynamic shapes, so queries of different token lengths share one graph instead of
+    # being padded to max_seq_length or recompiled per length. The compiled wrapper forwards
+    # attribute access (tokenize, device, encode) to the model it wraps.
+    compiled = torch.compile(model, dynamic=True)
+    try:
+        # Compilation is lazy; trigger it now so a missing toolchain surfaces at load time.
+        forward_encode(compiled, ["warmup"])
+    except Exception as exc:
+        print(f"Error: torch.compile failed for the embedding model, running it eagerly: {exc}", file=sys.stderr)
+        return model
+    return compiled
+
+
 def load_embedding_model(
     model_name: str,
     cache_folder: str | None = None,
     local_files_only_first: bool = True,
 ) -> SentenceTransformer:
+    # Imported here so loading the package does not pull in torch until a model is needed.
+    from sentence_transformers import SentenceTransformer
+
     resolved_cache_folder = cache_folder if cache_folder is not None else sentence_transformer_cache_folder()
+    configure_inference_threads()
+    device = detect_embedding_device()
+    backend_kwargs = {"device": device, **embedding_backend_kwargs(device)}
+    if backend_kwargs.get("backend") == "onnx":
+        # The model owns one InferenceSession for the life of the process; configure it here.
+        backend_kwargs["model_kwargs"]["session_options"] = onnx_session_options()
     if not local_files_only_first:
-        return SentenceTransformer(
+        model = SentenceTransformer(
             model_name,
             cache_folder=resolved_cache_folder,
             local_files_only=False,
+            **backend_kwargs,
         )
+        check_fast_tokenizer(model)
+        return use_torch_compile(use_half_precision(model, device), device)
 
     try:
-        return SentenceTransformer(
+        model = SentenceTransformer(
             model_name,
             cache_folder=resolved_cache_folder,
             local_files_only=True,
+            **backend_kwargs,
         )
     except Exception as exc:
-        print(f"Local cache miss for embedding model '{model_name}', retrying with network access: {exc}")
-        return SentenceTransformer(
+        print(f"Local cache miss for embedding model '{model_name}', retrying with network access: {exc}", file=sys.stderr)
+        model = SentenceTransformer(
             model_name,
             cache_folder=resolved_cache_folder,
             local_files_only=False,
+            **backend_kwargs,
         )
+    check_fast_tokenizer(model)
+    return use_torch_compile(use_half_precision(model, device), device)
 
 
 def load_search_resources(
@@ -84,6 +307,10 @@ def load_search_resources(
     default_k: int = K_RESULTS,
     include_disclaimers: bool = True,
     utm_source: str | None = None,
+    query_embedding_cache_path: str | None = None,
+    bm25_index_path: str | None = None,
+    encode_batch_window_ms: float = 0.0,
+    semantic_cache_threshold: float = 0.0,
 ) -> SearchResources:
     metadata = load_metadata(metadata_path)
     embedding_model = load_embedding_model(
@@ -91,11 +318,30 @@ def load_search_resources(
         cache_folder=cache_folder,
         local_files_only_first=local_files_only_first,
     )
-    usearch_index = load_usearch_index(
-        usearch_index_path,
-        embedding_dimension(embedding_model),
-    )
-    bm25_index = build_bm25_index(metadata)
+    index_model = load_index_manifest(usearch_index_path).get("model")
+    query_projection = load_query_projection(usearch_index_path)
+    dimension = embedding_dimension(embedding_model)
+    if query_projection is not None and query_projection[1].shape[0] != dimension:
+        print(f"Error: PCA projection expects {query_projection[1].shape[0]}-d embeddings but the model produces {dimension}.", file=sys.stderr)
+        query_projection = None
+    if index_model and index_model != model_name:
+        # Vectors from different models are not comparable; fall back to lexical search only.
+        print(f"Error: USearch index was built with '{index_model}' but the query model is '{model_name}'.", file=sys.stderr)
+        usearch_index = None
+        usearch_index_mapping = None
+    else:
+        usearch_index_mapping = map_usearch_index(usearch_index_path)
+        usearch_index = load_usearch_index(
+            usearch_index_path,
+            query_projection[1].shape[1] if query_projection is not None else dimension,
+            mapped_file=usearch_index_mapping,
+        )
+        if usearch_index is None and usearch_index_mapping is not None:
+            usearch_index_mapping.close()
+            usearch_index_mapping = None
+    bm25_index = load_bm25_index(bm25_index_path, metadata) or build_bm25_index(metadata)
+    if encode_batch_window_ms > 0:
+        embedding_model = BatchedEmbeddingModel(embedding_model, encode_batch_window_ms)
     return SearchResources(
         metadata=metadata,
         embedding_model=embedding_model,
@@ -104,16 +350,48 @@ def load_search_resources(
         default_k=default_k,
         include_disclaimers=include_disclaimers,
         utm_source=utm_source,
+        query_embedding_cache=open_embedding_cache(query_embedding_cache_path, embedding_cache_namespace(model_name)),
+        query_projection=query_projection,
+        semantic_cache=SemanticResultCache(dimension, semantic_cache_threshold) if semantic_cache_threshold > 0 else None,
+        usearch_index_mapping=usearch_index_mapping,
     )
 
 
+def warm_up_search_resources(resources: SearchResources) -> None:
+    """Run a throwaway encode and search so the first real query does not pay lazy initialization."""
+    # Bypass encode_query so the warm-up text never lands in the query caches.
+    for _ in range(2):
+        embeddings = forward_encode(resources.embedding_model, ["warmup"])
+    if resources.usearch_index is not None:
+        # Touch the distance kernels and the graph entry point as well.
+        query_embedding = np.asarray(embeddings[0], dtype=np.float32)
+        if resources.query_projection is not None:
+            query_embedding = project_query(query_embedding, resources.query_projection)
+        resources.usearch_index.search(query_embedding, 1, threads=1)
+
+
 def search(
     query: str,
     resources: SearchResources,
     k: int | None = None,
+    query_embedding: np.ndarray | None = None,
 ) -> list[dict[str, Any]]:
     resolved_k = k or resources.default_k
     candidate_depth = max(resolved_k * 20, 100)
+    semantic_key = None
+    if resources.usearch_index is not None and (
+        resources.query_projection is not None or resources.semantic_cache is not None
+    ):
+        if query_embedding is None:
+            query_embedding = encode_query(query, resources.embedding_model, resources.query_embedding_cache)
+        if resources.semantic_cache is not None:
+            cached = resources.semantic_cache.get(query_embedding, resolved_k)
+            if cached is not None:
+                return cached
+            semantic_key = query_embedding
+        if resources.query_projection is not None:
+            # Cached embeddings stay full-dimensional; only the index search uses the reduced space.
+            query_embedding = project_query(query_embedding, resources.query_projection)
     search_results = hybrid_search(
         query,
         resources.usearch_index,
@@ -122,22 +400,49 @@ def search(
         resources.bm25_index,
         k=deduplication_candidate_count(resolved_k),
         candidate_depth=candidate_depth,
+        disk_cache=resources.query_embedding_cache,
+        query_embedding=query_embedding,
     )
-    deduped = deduplicate_urls(search_results)[:resolved_k]
-    formatted = [
-        {
-            "url": item["metadata"].get("url"),
-            "snippet": item["metadata"].get("original_text", item["metadata"].get("content", "")),
-            "title": item["metadata"].get("title", ""),
-            "heading": item["metadata"].get("heading", ""),
-            "doc_type": item["metadata"].get("doc_type", ""),
-            "product": item["metadata"].get("product", ""),
-            "distance": item.get("distance"),
-            "score": item.get("rerank_score", item.get("rrf_score")),
-        }
-        for item in deduped
-    ]
+    # Keep the best-ranked candidate per URL: np.unique returns each URL's first position.
+    rows = np.fromiter((item["row"] for item in search_results), dtype=np.int64, count=len(search_results))
+    url_ids = resources.url_ids[rows]
+    _, first_positions = np.unique(url_ids, return_index=True)
+    first_positions = np.sort(first_positions[url_ids[first_positions] >= 0])[:resolved_k]
+    formatted = []
+    for position in first_positions.tolist():
+        item = search_results[position]
+        url, snippet, title, heading, doc_type, product = resources.result_fields[item["row"]]
+        formatted.append(
+            {
+                "url": url,
+                "snippet": snippet,
+                "title": title,
+                "heading": heading,
+                "doc_type": doc_type,
+                "product": product,
+                "distance": item.get("distance"),
+                "score": item.get("rerank_score", item.get("rrf_score")),
+            }
+        )
     formatted = add_utm_source_to_results(formatted, resources.utm_source)
     if resources.include_disclaimers:
-        return add_disclaimer_to_arm_results(formatted)
+        formatted = add_disclaimer_to_arm_results(formatted)
+    if semantic_key is not None:
+        resources.semantic_cache.put(semantic_key, resolved_k, formatted)
     return formatted
+
+
+def search_batch(
+    queries: list[str],
+    resources: SearchResources,
+    k: int | None = None,
+) -> list[list[dict[str, Any]]]:
+    """Search several queries, embedding all uncached ones with one batched encode."""
+    unique_queries = list(dict.fromkeys(normalize_query(query) for query in queries))
+    embeddings: dict[str, np.ndarray] = {}
+    if resources.usearch_index is not None and unique_queries:
+        embeddings = dict(
+            zip(unique_queries, encode_queries(unique_queries, resources.embedding_model, resources.query_embedding_cache))
+        )
+    results = {query: search(query, resources, k, query_embedding=embeddings.get(query)) for query in unique_queries}
+    return [results[normalize_query(query)] for query in queries]
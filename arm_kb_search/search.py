@@ -12,21 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict, Iterable, List, Optional
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 import re
+import threading
 from urllib.parse import urlparse
 
 import numpy as np
 from rank_bm25 import BM25Okapi
-from sentence_transformers import SentenceTransformer
-from usearch.index import Index
+from usearch.index import Index, MetricKind
+
+from .config import DISTANCE_THRESHOLD, K_RESULTS, QUERY_ENCODE_BATCH_SIZE, QUERY_EMBEDDING_CACHE_SIZE
+from .embedding_cache import DiskEmbeddingCache
 
-from .config import DISTANCE_THRESHOLD, K_RESULTS
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 SEARCH_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_\-+.]*", re.IGNORECASE)
 TOKEN_SPLIT_PATTERN = re.compile(r"[_\-+.]+")
 RRF_K = 60
+# Distances are reported in squared-L2 units. For unit vectors, l2sq = 2 * (1 - cos), so
+# inner-product and cosine distances are scaled to match DISTANCE_THRESHOLD.
+UNIT_VECTOR_DISTANCE_SCALE = {MetricKind.IP: 2.0, MetricKind.Cos: 2.0}
 LEXICAL_PREPASS_DEPTH = 400
 PINNED_LEXICAL_CANDIDATES = 20
 DEDUPLICATION_CANDIDATE_MULTIPLIER = 10
@@ -259,51 +269,149 @@ def build_bm25_index(metadata: List[Dict]) -> Optional[BM25Okapi]:
     return BM25Okapi(corpus)
 
 
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").split())
+
+
+def forward_encode(embedding_model: SentenceTransformer, sentences: List[str]) -> np.ndarray:
+    """Embed sentences with one tokenize call and a direct forward pass.
+
+    Skips encode()'s per-call bookkeeping (length sorting, progress bar, device moves), which is
+    a noticeable share of a single short query. Wrappers that are not SentenceTransformer modules
+    (e.g. BatchedEmbeddingModel) go through their plain encode() instead; it must be called
+    without keyword arguments, which the batcher treats as a request to bypass coalescing.
+    """
+    if not callable(embedding_model):
+        return np.asarray(embedding_model.encode(sentences), dtype=np.float32)
+    import torch
+
+    preprocess = getattr(embedding_model, "preprocess", None) or embedding_model.tokenize
+    features = {
+        name: value.to(embedding_model.device) if isinstance(value, torch.Tensor) else value
+        for name, value in preprocess(sentences).items()
+    }
+    with torch.inference_mode():
+        embeddings = embedding_model(features)["sentence_embedding"]
+    return embeddings.float().cpu().numpy()
+
+
+# In-process memo of query embeddings, shared by single and batch encodes so a query always
+# searches with the same vector. Keyed by (model, disk cache, normalized query); values are
+# immutable bytes so callers can never mutate a shared embedding.
+_query_embeddings: "OrderedDict[Tuple[Any, Any, str], bytes]" = OrderedDict()
+_query_embeddings_lock = threading.Lock()
+
+
+def clear_query_embedding_cache() -> None:
+    """Drop memoized query embeddings, e.g. when the embedding model is reloaded."""
+    with _query_embeddings_lock:
+        _query_embeddings.clear()
+
+
+def encode_query(
+    query: str,
+    embedding_model: SentenceTransformer,
+    disk_cache: Optional[DiskEmbeddingCache] = None,
+) -> np.ndarray:
+    """Embed a query, reusing the cached embedding for repeat queries."""
+    return encode_queries([query], embedding_model, disk_cache)[0]
+
+
+def encode_queries(
+    queries: List[str],
+    embedding_model: SentenceTransformer,
+    disk_cache: Optional[DiskEmbeddingCache] = None,
+) -> np.ndarray:
+    """Embed several queries: memoized ones first, then the disk cache, then one batched encode."""
+    keys = [(embedding_model, disk_cache, normalize_query(query)) for query in queries]
+    with _query_embeddings_lock:
+        embeddings: List[Optional[bytes]] = [_query_embeddings.get(key) for key in keys]
+        for key, embedding in zip(keys, embeddings):
+            if embedding is not None:
+                _query_embeddings.move_to_end(key)
+    found: Dict[Tuple[Any, Any, str], bytes] = {}
+    missing = []
+    for position, key in enumerate(keys):
+        if embeddings[position] is not None or key in found:
+            continue
+        embedding = disk_cache.get(key[2]) if disk_cache is not None else None
+        if embedding is None:
+            missing.append(position)
+            found[key] = b""
+        else:
+            found[key] = np.asarray(embedding, dtype=np.float32).tobytes()
+    if missing:
+        # Group similar lengths into each chunk so padding to the longest query wastes little work.
+        missing.sort(key=lambda position: len(keys[position][2]))
+        missing_queries = [keys[position][2] for position in missing]
+        encoded = np.concatenate(
+            [
+                forward_encode(embedding_model, missing_queries[start : start + QUERY_ENCODE_BATCH_SIZE])
+                for start in range(0, len(missing_queries), QUERY_ENCODE_BATCH_SIZE)
+            ]
+        )
+        norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+        encoded /= np.where(norms == 0, 1.0, norms)
+        for query, embedding in zip(missing_queries, encoded):
+            found[(embedding_model, disk_cache, query)] = embedding.tobytes()
+            if disk_cache is not None:
+                disk_cache.put(query, embedding)
+    if found:
+        with _query_embeddings_lock:
+            for key, embedding in found.items():
+                # Another thread may have memoized this query meanwhile; keep its vector.
+                found[key] = _query_embeddings.setdefault(key, embedding)
+                _query_embeddings.move_to_end(key)
+            while len(_query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                _query_embeddings.popitem(last=False)
+    return np.stack(
+        [
+            np.frombuffer(embedding if embedding is not None else found[key], dtype=np.float32)
+            for key, embedding in zip(keys, embeddings)
+        ]
+    )
+
+
+def project_query(embedding: np.ndarray, projection: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """Reduce a query embedding with the index's PCA projection, keeping it unit length."""
+    mean, components = projection
+    reduced = ((embedding - mean) @ components).astype(np.float32)
+    reduced /= np.linalg.norm(reduced) or 1.0
+    return reduced
+
+
 def embedding_search(
     query: str,
     usearch_index: Optional[Index],
     metadata: List[Dict],
     embedding_model: SentenceTransformer,
     k: int = K_RESULTS,
+    disk_cache: Optional[DiskEmbeddingCache] = None,
+    query_embedding: Optional[np.ndarray] = None,
 ) -> List[Dict[str, Any]]:
-    """Search the USearch index with a text query."""
+    """Search the USearch index with a text query, or with its precomputed embedding."""
     if usearch_index is None:
         return []
-    query_embedding = embedding_model.encode([query])[0]
-    matches = usearch_index.search(query_embedding, k)
-    results: List[Dict[str, Any]] = []
-    if matches is None:
-        return results
-
-    try:
-        labels = getattr(matches, "keys", None)
-        distances = getattr(matches, "distances", None)
-        if labels is None or distances is None:
-            if isinstance(matches, tuple) and len(matches) == 2:
-                labels, distances = matches
-            elif isinstance(matches, dict):
-                labels = matches.get("labels", matches.get("indices"))
-                distances = matches.get("distances")
-        if labels is None or distances is None:
-            return results
-
-        labels = np.atleast_1d(labels)
-        distances = np.atleast_1d(distances)
-        for rank, (idx, dist) in enumerate(zip(labels, distances), start=1):
-            if idx == -1:
-                continue
-            distance = float(dist)
-            if distance < DISTANCE_THRESHOLD:
-                results.append(
-                    {
-                        "rank": rank,
-                        "distance": distance,
-                        "metadata": metadata[int(idx)],
-                    }
-                )
-    except Exception as exc:
-        print(f"Error processing dense matches: {exc}")
-    return results
+    if query_embedding is None:
+        query_embedding = encode_query(query, embedding_model, disk_cache)
+    # One query is served by one thread; threads=0 would dispatch through a pool sized to every core.
+    matches = usearch_index.search(query_embedding, k, threads=1)
+    # Single-query searches return 1-D arrays; USearch never pads them with missing keys.
+    keys = matches.keys
+    distances = matches.distances * UNIT_VECTOR_DISTANCE_SCALE.get(usearch_index.metric, 1.0)
+    mask = distances < DISTANCE_THRESHOLD
+    # tolist() converts the surviving entries to Python ints/floats in one C call.
+    return [
+        {
+            "rank": rank,
+            "distance": distance,
+            "row": key,
+            "metadata": metadata[key],
+        }
+        for rank, key, distance in zip(
+            (np.flatnonzero(mask) + 1).tolist(), keys[mask].tolist(), distances[mask].tolist()
+        )
+    ]
 
 
 def bm25_search(
@@ -328,6 +436,7 @@ def bm25_search(
             {
                 "rank": rank,
                 "bm25_score": score,
+                "row": int(idx),
                 "metadata": metadata[int(idx)],
             }
         )
@@ -521,6 +630,8 @@ def hybrid_search(
     bm25_index: Optional[BM25Okapi],
     k: int = K_RESULTS,
     candidate_depth: Optional[int] = None,
+    disk_cache: Optional[DiskEmbeddingCache] = None,
+    query_embedding: Optional[np.ndarray] = None,
 ) -> List[Dict[str, Any]]:
     candidate_depth = candidate_depth or max(k * 20, 100)
     lexical_results = lexical_prepass_search(
@@ -530,7 +641,15 @@ def hybrid_search(
         k=max(k * 3, PINNED_LEXICAL_CANDIDATES),
         candidate_depth=max(candidate_depth, LEXICAL_PREPASS_DEPTH),
     )
-    dense_results = embedding_search(query, usearch_index, metadata, embedding_model, candidate_depth)
+    dense_results = embedding_search(
+        query,
+        usearch_index,
+        metadata,
+        embedding_model,
+        candidate_depth,
+        disk_cache=disk_cache,
+        query_embedding=query_embedding,
+    )
     sparse_results = bm25_search(query, metadata, bm25_index, candidate_depth)
 
     candidates: Dict[str, Dict[str, Any]] = {}
@@ -543,7 +662,7 @@ def hybrid_search(
 
     for result in dense_results:
         candidate_key = _candidate_key(result)
-        existing = candidates.get(candidate_key, {"metadata": result["metadata"], "rrf_score": 0.0})
+        existing = candidates.get(candidate_key, {"metadata": result["metadata"], "row": result["row"], "rrf_score": 0.0})
         existing["rank"] = min(existing.get("rank", result["rank"]), result["rank"])
         existing["distance"] = result["distance"]
         existing["rrf_score"] += 1 / (RRF_K + result["rank"])
@@ -551,7 +670,7 @@ def hybrid_search(
 
     for result in sparse_results:
         candidate_key = _candidate_key(result)
-        existing = candidates.get(candidate_key, {"metadata": result["metadata"], "rrf_score": 0.0})
+        existing = candidates.get(candidate_key, {"metadata": result["metadata"], "row": result["row"], "rrf_score": 0.0})
         existing["rank"] = min(existing.get("rank", result["rank"]), result["rank"])
         existing["bm25_score"] = result["bm25_score"]
         existing["rrf_score"] += 1 / (RRF_K + result["rank"])
@@ -0,0 +1,71 @@
+# Copyright © 2025, Arm Limited and Contributors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from usearch.index import Index
+
+from .config import SEMANTIC_CACHE_SIZE
+
+
+class SemanticResultCache:
+    """Reuse search results for paraphrased queries whose embeddings are nearly identical.
+
+    Recent query embeddings live in a small in-memory cosine index. A lookup returns the stored
+    results of the nearest previous query when its cosine similarity is at least `threshold`.
+    """
+
+    def __init__(self, ndim: int, threshold: float, max_entries: int = SEMANTIC_CACHE_SIZE):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # USearch defaults to bf16, whose rounding can flip hit/miss decisions near the threshold.
+        self._index = Index(ndim=ndim, metric="cos", dtype="f32")
+        # Key -> (k, results), in least- to most-recently used order.
+        self._entries: "OrderedDict[int, Tuple[int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def get(self, embedding: np.ndarray, k: int) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            if not self._entries:
+                return None
+            matches = self._index.search(embedding, 1, threads=1)
+            if len(matches.keys) == 0 or 1.0 - float(matches.distances[0]) < self.threshold:
+                return None
+            key = int(matches.keys[0])
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != k:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[1])
+
+    def put(self, embedding: np.ndarray, k: int, results: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._index.add(key, np.asarray(embedding, dtype=np.float32))
+            self._entries[key] = (k, copy.deepcopy(results))
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._index.remove(evicted_key)
+
+    def clear(self) -> None:
+        """Drop all cached results, e.g. after the underlying data files change."""
+        with self._lock:
+            self._index.reset()
+            self._entries.clear()
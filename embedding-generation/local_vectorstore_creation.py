@@ -15,19 +15,66 @@
 import yaml
 import numpy as np
 import math
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import json
+import orjson
 import os
 import glob
 import datetime
+import torch
 from sentence_transformers import SentenceTransformer
 from usearch.index import Index
 
 
+# USearch quantizes vectors to int8 on add, a quarter of the f32 footprint, with recall on
+# par with f16 for normalized MiniLM vectors. USearch records the dtype in the index header.
+USEARCH_DTYPE = os.getenv('USEARCH_DTYPE', 'i8')
+# Embeddings are unit-normalized, so inner product ranks exactly like cosine without the
+# per-comparison normalization. USearch's int8 kernels are only scaled correctly for cosine.
+# The metric is stored in the index header, which the loader restores it from.
+USEARCH_METRIC = 'cos' if USEARCH_DTYPE == 'i8' else 'ip'
+# libyaml-backed loader is several times faster; fall back when PyYAML was built without it.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+# HNSW graph parameters; keep in sync with arm_kb_search.loaders.load_usearch_index.
+USEARCH_CONNECTIVITY = 16
+USEARCH_EXPANSION_ADD = 128
+USEARCH_EXPANSION_SEARCH = 64
+# Any SentenceTransformer-loadable model, including Model2Vec static models such as
+# minishlab/potion-base-8M. The server must query with the same model; it is recorded in the manifest.
+EMBEDDING_MODEL_NAME = os.getenv('SENTENCE_TRANSFORMER_MODEL', 'all-MiniLM-L6-v2')
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '0')) or None
+# Optional PCA reduction of the stored vectors (e.g. 384 -> 128 for MiniLM), which shrinks the
+# index and its distance computations. 0 keeps the model's full dimension. Check recall with
+# evaluate_retrieval.py before shipping a reduced index.
+PCA_COMPONENTS = int(os.getenv('PCA_COMPONENTS', '0'))
+
+
 def sentence_transformer_cache_folder():
     return os.getenv("SENTENCE_TRANSFORMERS_HOME") or None
 
 
+def _chunk_uuid(file_path: str, intrinsic_dir: str, yaml_dir: str) -> str:
+    """Extract the chunk identifier based on file location."""
+    if os.path.normpath(file_path).startswith(os.path.normpath(intrinsic_dir)):
+        return f"intrinsic_{os.path.basename(file_path).replace('.yaml', '')}"
+    if os.path.normpath(file_path).startswith(os.path.normpath(yaml_dir)):
+        return f"yaml_data_{os.path.basename(file_path).replace('.yaml', '')}"
+    return file_path.replace('chunk_', '').replace('.yaml', '')
+
+
+def _load_yaml_file(file_path: str, intrinsic_dir: str, yaml_dir: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Parse one chunk file in a worker process; returns (path, content, error)."""
+    try:
+        with open(file_path, 'r') as f:
+            yaml_content = yaml.load(f, Loader=YAML_LOADER)
+        yaml_content['chunk_uuid'] = _chunk_uuid(file_path, intrinsic_dir, yaml_dir)
+        return file_path, yaml_content, None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
 def load_local_yaml_files() -> List[Dict]:
     """Load locally stored YAML files and return their contents as a list of dictionaries."""
     print("Loading local YAML files")
@@ -46,44 +93,107 @@ def load_local_yaml_files() -> List[Dict]:
     total_files = len(all_files)
     print(f"Total files to process: {total_files}")
 
-    for i, file_path in enumerate(all_files, 1):
-        if i <= 10 or i % 1000 == 0 or i == total_files:
-            print(f"Loading file {i}/{total_files}: {file_path}")
-
-        # Extract chunk identifier based on file location
-        if os.path.normpath(file_path).startswith(os.path.normpath(intrinsic_dir)):
-            chunk_uuid = f"intrinsic_{os.path.basename(file_path).replace('.yaml', '')}"
-        elif os.path.normpath(file_path).startswith(os.path.normpath(yaml_dir)):
-            chunk_uuid = f"yaml_data_{os.path.basename(file_path).replace('.yaml', '')}"
-        else:
-            chunk_uuid = file_path.replace('chunk_', '').replace('.yaml', '')
-
-        try:
-            with open(file_path, 'r') as f:
-                yaml_content = yaml.safe_load(f)
-                yaml_content['chunk_uuid'] = chunk_uuid
-                yaml_contents.append(yaml_content)
-        except Exception as e:
-            print(f"Error loading {file_path}: {e}")
-            continue
+    # Parsing is independent per file, so spread it across processes. map() keeps the
+    # original file order, which keeps index keys stable between builds.
+    workers = int(os.getenv("YAML_LOAD_WORKERS", "0")) or os.cpu_count() or 1
+    chunksize = max(1, total_files // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _load_yaml_file,
+            all_files,
+            itertools.repeat(intrinsic_dir),
+            itertools.repeat(yaml_dir),
+            chunksize=chunksize,
+        )
+        for i, (file_path, yaml_content, error) in enumerate(results, 1):
+            if i <= 10 or i % 1000 == 0 or i == total_files:
+                print(f"Loading file {i}/{total_files}: {file_path}")
+            if error is not None:
+                print(f"Error loading {file_path}: {error}")
+                continue
+            yaml_contents.append(yaml_content)
 
     print(f"Successfully loaded {len(yaml_contents)} YAML files")
     return yaml_contents
 
 
-def create_embeddings(contents: List[str], model_name: str = 'all-MiniLM-L6-v2') -> np.ndarray:
+def embedding_device() -> str:
+    """Pick the device for embedding generation, overridable with EMBEDDING_DEVICE."""
+    return os.getenv('EMBEDDING_DEVICE') or ('cuda' if torch.cuda.is_available() else 'cpu')
+
+
+def create_embeddings(contents: List[str], model_name: str = EMBEDDING_MODEL_NAME) -> np.ndarray:
     """Create embeddings for the given contents using SentenceTransformers."""
-    print(f"Creating embeddings using model: {model_name}")
+    device = embedding_device()
+    print(f"Creating embeddings using model: {model_name} on {device}")
     model = SentenceTransformer(
         model_name,
+        device=device,
         cache_folder=sentence_transformer_cache_folder(),
         local_files_only=True,
     )
-    embeddings = model.encode(contents, show_progress_bar=True, convert_to_numpy=True)
+    if device == 'cuda':
+        # FP16 roughly doubles GPU throughput; vectors are stored as f16 anyway.
+        model = model.half()
+        batch_size = EMBEDDING_BATCH_SIZE or 256
+    else:
+        torch.set_num_threads(os.cpu_count() or 1)
+        batch_size = EMBEDDING_BATCH_SIZE or 64
+    # encode() already length-sorts its inputs before batching and restores the original
+    # order on return, so batches are padding-efficient and rows stay aligned with metadata.
+    embeddings = model.encode(
+        contents,
+        batch_size=batch_size,
+        show_progress_bar=True,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    embeddings = np.asarray(embeddings, dtype=np.float32)
     print(f"Created embeddings with shape: {embeddings.shape}")
     return embeddings
 
 
+def fit_pca_projection(embeddings: np.ndarray, n_components: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit PCA on the corpus embeddings; returns the mean and a (ndim, n_components) projection."""
+    mean = embeddings.mean(axis=0)
+    # Rows of vt are the principal axes, ordered by explained variance.
+    _, _, vt = np.linalg.svd(embeddings - mean, full_matrices=False)
+    return mean.astype(np.float32), np.ascontiguousarray(vt[:n_components].T, dtype=np.float32)
+
+
+def project_embeddings(embeddings: np.ndarray, mean: np.ndarray, projection: np.ndarray) -> np.ndarray:
+    """Apply a PCA projection and re-normalize, so the reduced vectors stay unit length."""
+    reduced = (embeddings - mean) @ projection
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    return (reduced / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+
+def save_embedding_matrix(
+    embeddings: np.ndarray,
+    embeddings_filename: str,
+    manifest_filename: str,
+    model_name: str = EMBEDDING_MODEL_NAME,
+    projection_filename: Optional[str] = None,
+) -> None:
+    """Save embeddings as one contiguous float16 matrix plus a small manifest describing it."""
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float16)
+    np.save(embeddings_filename, matrix)
+    manifest = {
+        'ndim': int(matrix.shape[1]),
+        'dtype': 'f16',
+        'count': int(matrix.shape[0]),
+        'index_dtype': USEARCH_DTYPE,
+        'metric': USEARCH_METRIC,
+        'model': model_name,
+        'embeddings_file': os.path.basename(embeddings_filename),
+    }
+    if projection_filename:
+        # The server projects each query with the same mean and axes before searching.
+        manifest['projection_file'] = os.path.basename(projection_filename)
+    with open(manifest_filename, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
 def create_usearch_index(embeddings: np.ndarray, metadata: List[Dict]) -> Tuple[Index, List[Dict]]:
     """Create a USearch index with the given embeddings and metadata."""
     print("Creating USearch index")
@@ -95,17 +205,17 @@ def create_usearch_index(embeddings: np.ndarray, metadata: List[Dict]) -> Tuple[
     # Create USearch index
     index = Index(
         ndim=dimension,
-        metric='l2sq',
-        dtype='f32',
-        connectivity=16,
-        expansion_add=128,
-        expansion_search=64
+        metric=USEARCH_METRIC,
+        dtype=USEARCH_DTYPE,
+        connectivity=USEARCH_CONNECTIVITY,
+        expansion_add=USEARCH_EXPANSION_ADD,
+        expansion_search=USEARCH_EXPANSION_SEARCH
     )
     
-    # Add vectors to the index
+    # Add all vectors in one batch call so USearch can build the graph on every core.
+    # Keys are row numbers, which is how search results map back to metadata entries.
     print(f"Adding {num_vectors} vectors to the index")
-    for i, embedding in enumerate(embeddings):
-        index.add(i, embedding)
+    index.add(np.arange(num_vectors), np.ascontiguousarray(embeddings, dtype=np.float32))
     
     print(f"Added {len(index)} vectors to the index")
     return index, metadata
@@ -126,20 +236,6 @@ def main():
             print(f"Processing YAML content {i}/{len(yaml_contents)}")
         contents.append(yaml_content['content'])
         heading_path = yaml_content.get('heading_path', []) or []
-        search_text = " ".join(
-            str(value)
-            for value in [
-                yaml_content.get('title', ''),
-                " ".join(heading_path),
-                yaml_content.get('heading', ''),
-                yaml_content.get('doc_type', ''),
-                yaml_content.get('product', ''),
-                yaml_content.get('version', ''),
-                yaml_content.get('keywords', ''),
-                yaml_content.get('content', ''),
-            ]
-            if value
-        )
         metadata.append({
             'uuid': yaml_content['uuid'],
             'url': yaml_content['url'],
@@ -154,7 +250,8 @@ def main():
             'product': yaml_content.get('product', ''),
             'version': yaml_content.get('version', ''),
             'content_type': yaml_content.get('content_type', ''),
-            'search_text': search_text,
+            # search_text is rebuilt from these fields at load time (arm_kb_search.loaders),
+            # which keeps the chunk text from being stored twice.
         })
 
     # Create embeddings
@@ -162,8 +259,23 @@ def main():
 
     print("Saving embeddings to file")
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"embeddings_{timestamp}.txt"
-    np.savetxt(filename, embeddings)
+    np.save(f"embeddings_{timestamp}.npy", embeddings.astype(np.float32))
+    if os.getenv("DUMP_EMBEDDINGS_TXT", "").strip().lower() in {"1", "true", "yes", "on"}:
+        # Human-readable dump for debugging only; it is ~20x larger and much slower to write.
+        np.savetxt(f"embeddings_{timestamp}.txt", embeddings)
+
+    projection_filename = None
+    if PCA_COMPONENTS:
+        projection_filename = os.getenv('PCA_PROJECTION_FILENAME', 'pca_projection.npz')
+        print(f"Reducing embeddings to {PCA_COMPONENTS} dimensions with PCA; saving projection to {projection_filename}")
+        mean, projection = fit_pca_projection(embeddings, PCA_COMPONENTS)
+        np.savez(projection_filename, mean=mean, projection=projection)
+        embeddings = project_embeddings(embeddings, mean, projection)
+
+    embeddings_filename = os.getenv('EMBEDDINGS_FILENAME', 'embeddings.f16.npy')
+    manifest_filename = os.getenv('MANIFEST_FILENAME', 'manifest.json')
+    print(f"Saving float16 embedding matrix to {embeddings_filename}")
+    save_embedding_matrix(embeddings, embeddings_filename, manifest_filename, projection_filename=projection_filename)
 
     # Create USearch index
     print("Creating USearch index")
@@ -177,13 +289,14 @@ def main():
     # Save metadata
     metadata_filename = os.getenv('METADATA_FILENAME', 'metadata.json')
     print(f"Saving metadata to {metadata_filename}")
-    with open(metadata_filename, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    with open(metadata_filename, 'wb') as f:
+        f.write(orjson.dumps(metadata))
 
     print("USearch index and metadata have been created and saved.")
     print(f"Total documents processed: {len(contents)}")
     print(f"USearch index saved to: {os.path.abspath(index_filename)}")
     print(f"Metadata saved to: {os.path.abspath(metadata_filename)}")
+    print(f"Embedding matrix saved to: {os.path.abspath(embeddings_filename)}")
 
 if __name__ == "__main__":
     main()
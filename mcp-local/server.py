@@ -13,11 +13,29 @@
 # limitations under the License.
 
 from fastmcp import FastMCP
+from functools import lru_cache
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
-import arm_kb_search
-from utils.config import METADATA_PATH, USEARCH_INDEX_PATH, MODEL_NAME, SUPPORTED_SCANNERS, DEFAULT_ARCH
-from utils.docker_utils import check_docker_image_architectures
+import signal
+import threading
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union
+
+from utils.config import (
+    METADATA_PATH,
+    USEARCH_INDEX_PATH,
+    BM25_INDEX_PATH,
+    MODEL_NAME,
+    QUERY_EMBEDDING_CACHE_PATH,
+    POPULAR_QUERIES_PATH,
+    PRELOAD_SEARCH_RESOURCES,
+    WARM_UP_SEARCH_RESOURCES,
+    ENCODE_BATCH_WINDOW_MS,
+    SEMANTIC_CACHE_THRESHOLD,
+    MAX_QUERY_CHARS,
+    SUPPORTED_SCANNERS,
+    SUPPORTED_SCANNERS_SORTED,
+    DEFAULT_ARCH,
+)
 from utils.apx import (
     prepare_target,
     run_workload,
@@ -25,23 +43,103 @@ from utils.apx import (
     resolve_apx_ssh_mount_env,
     build_apx_ssh_mount_help,
 )
-from utils.migrate_ease_utils import run_migrate_ease_scan
+from utils.migrate_ease_utils import run_migrate_ease_scan, run_migrate_ease_scans
 from utils.skopeo_tool import skopeo_help, skopeo_inspect
 from utils.llvm_mca_tool import mca_help, llvm_mca_analyze
 from utils.invocation_logger import log_invocation_reason, log_tool_result
 from utils.error_handling import format_tool_error
 
+if TYPE_CHECKING:
+    # Imported on first search instead: numpy, USearch and BM25 add ~0.1s to the MCP handshake.
+    import arm_kb_search
+
 # Initialize the MCP server
 mcp = FastMCP("arm-mcp")
 
 
-# Load USearch index and metadata at module load time
-SEARCH_RESOURCES = arm_kb_search.load_search_resources(
-    metadata_path=METADATA_PATH,
-    usearch_index_path=USEARCH_INDEX_PATH,
-    model_name=MODEL_NAME,
-    utm_source="arm-mcp",
-)
+# Search resources (embedding model, USearch index, metadata). By default they are preloaded on a
+# background thread at startup (see PRELOAD_SEARCH_RESOURCES), so every session loads torch; with
+# preloading off they load on the first search, and sessions that only use other tools never do.
+_SEARCH_RESOURCES: Optional["arm_kb_search.SearchResources"] = None
+_SEARCH_RESOURCES_LOCK = threading.Lock()
+
+
+def _get_search_resources() -> "arm_kb_search.SearchResources":
+    global _SEARCH_RESOURCES
+    if _SEARCH_RESOURCES is None:
+        with _SEARCH_RESOURCES_LOCK:
+            if _SEARCH_RESOURCES is None:
+                import arm_kb_search
+
+                resources = arm_kb_search.load_search_resources(
+                    metadata_path=METADATA_PATH,
+                    usearch_index_path=USEARCH_INDEX_PATH,
+                    model_name=MODEL_NAME,
+                    utm_source="arm-mcp",
+                    query_embedding_cache_path=QUERY_EMBEDDING_CACHE_PATH,
+                    bm25_index_path=BM25_INDEX_PATH,
+                    encode_batch_window_ms=ENCODE_BATCH_WINDOW_MS,
+                    semantic_cache_threshold=SEMANTIC_CACHE_THRESHOLD,
+                )
+                if WARM_UP_SEARCH_RESOURCES:
+                    try:
+                        arm_kb_search.warm_up_search_resources(resources)
+                    except Exception:
+                        # Warm-up is best effort; a failure here will surface on the search itself instead.
+                        pass
+                _SEARCH_RESOURCES = resources
+    return _SEARCH_RESOURCES
+
+
+@lru_cache(maxsize=None)
+def _popular_queries() -> Dict[str, List[Dict[str, Any]]]:
+    import arm_kb_search
+
+    return arm_kb_search.load_popular_queries(POPULAR_QUERIES_PATH)
+
+
+def _normalize_search_query(query: str) -> str:
+    # Spacing variants share one cache entry. Case is kept: the query reaches the embedding
+    # model, and a cased SENTENCE_TRANSFORMER_MODEL can rank "Arm" and "arm" differently.
+    return " ".join(query[:MAX_QUERY_CHARS].split())
+
+
+@lru_cache(maxsize=1024)
+def _kb_search_cached(normalized_query: str) -> Tuple[Tuple[Tuple[str, Any], ...], ...]:
+    import arm_kb_search
+
+    # Hold only immutable data so no caller can alter another caller's results.
+    return tuple(
+        tuple(result.items())
+        for result in arm_kb_search.search(normalized_query, _get_search_resources())
+    )
+
+
+def _reload_search_resources() -> None:
+    global _SEARCH_RESOURCES
+    import arm_kb_search
+
+    # Drop the loaded model, index, metadata and popular queries so the next search reads the
+    # data files again, then clear every cache that could still hold results from the old data.
+    with _SEARCH_RESOURCES_LOCK:
+        _SEARCH_RESOURCES = None
+        _popular_queries.cache_clear()
+        _kb_search_cached.cache_clear()
+        arm_kb_search.clear_query_embedding_cache()
+    if PRELOAD_SEARCH_RESOURCES:
+        _get_search_resources()
+
+
+if hasattr(signal, "SIGHUP"):
+    # Let operators reload search data (e.g. after swapping data files) without a restart;
+    # SIGHUP no longer terminates the server. Reloaded off the signal handler so it never
+    # waits on a lock the interrupted thread holds.
+    signal.signal(
+        signal.SIGHUP,
+        lambda signum, frame: threading.Thread(
+            target=_reload_search_resources, name="search-reload", daemon=True
+        ).start(),
+    )
 
 
 # error formatter now lives in utils/error_handling.py
@@ -67,7 +165,15 @@ def knowledge_base_search(query: str, invocation_reason: Optional[str] = None) -
         List of dictionaries with metadata including url and text snippets.
     """
     try:
-        results = arm_kb_search.search(query, SEARCH_RESOURCES)
+        normalized_query = _normalize_search_query(query)
+        if not normalized_query:
+            # Nothing to match; skip loading popular queries, encoding and searching entirely.
+            results = []
+        elif normalized_query.lower() in _popular_queries():
+            # Popular queries are keyed in lowercase, so they match in any case.
+            results = [dict(result) for result in _popular_queries()[normalized_query.lower()]]
+        else:
+            results = [dict(result) for result in _kb_search_cached(normalized_query)]
         log_tool_result(entry_id, "knowledge_base_search", results)
         return results
     except Exception as e:
@@ -79,9 +185,43 @@ def knowledge_base_search(query: str, invocation_reason: Optional[str] = None) -
 
 
 @mcp.tool(
-    description="Check Docker image architectures. Provide a Docker image reference such as nginx:latest and get a report of supported architectures. Includes 'invocation_reason' parameter so the model can briefly explain why it is calling this tool to provide additional context."
+    description="Batch form of knowledge_base_search: searches the Arm knowledge base for several natural language queries in one call, which is faster than calling knowledge_base_search once per query. Returns one list of matching resources (URLs, titles, content snippets) per query, in the same order as 'queries'. Returned URLs may include tracking query parameters such as utm_source=arm-mcp and URL fragments; preserve each URL exactly as returned when sharing or citing it. Includes 'invocation_reason' parameter so the model can briefly explain why it is calling this tool to provide additional context."
+)
+def knowledge_base_search_batch(queries: List[str], invocation_reason: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+    entry_id = log_invocation_reason(
+        tool="knowledge_base_search_batch",
+        reason=invocation_reason,
+        args={"queries": queries},
+    )
+    try:
+        normalized_queries = [_normalize_search_query(query) for query in queries]
+        # Queries not served from the popular set are embedded together in one encode call.
+        # Empty queries match nothing, so a batch of only empty queries never loads the popular set.
+        popular_queries = _popular_queries() if any(normalized_queries) else {}
+        pending = [query for query in normalized_queries if query and query.lower() not in popular_queries]
+        searched: Dict[str, List[Dict[str, Any]]] = {"": []}
+        if pending:
+            import arm_kb_search
+
+            searched.update(zip(pending, arm_kb_search.search_batch(pending, _get_search_resources())))
+        results = [
+            [dict(result) for result in (searched[query] if query in searched else popular_queries[query.lower()])]
+            for query in normalized_queries
+        ]
+        log_tool_result(entry_id, "knowledge_base_search_batch", results)
+        return results
+    except Exception as e:
+        return format_tool_error(
+            tool="knowledge_base_search_batch",
+            exc=e,
+            args={"queries": queries},
+        )
+
+
+@mcp.tool(
+    description="Check Docker image architectures. Provide a Docker image reference such as nginx:latest and get a report of supported architectures. To check several images at once (e.g. every image in a compose file), pass a list of references; the result is then a dictionary keyed by image. Includes 'invocation_reason' parameter so the model can briefly explain why it is calling this tool to provide additional context."
 )
-def check_image(image: str, invocation_reason: Optional[str] = None) -> dict:
+def check_image(image: Union[str, List[str]], invocation_reason: Optional[str] = None) -> dict:
     log_invocation_reason(
         tool="check_image",
         reason=invocation_reason,
@@ -90,12 +230,17 @@ def check_image(image: str, invocation_reason: Optional[str] = None) -> dict:
     """Check Docker image architectures
     
     Args:
-        image: Docker image name (format: name:tag)
+        image: Docker image name (format: name:tag), or a list of them
         
     Returns:
-        Dictionary with architecture information
+        Dictionary with architecture information, keyed by image when a list is given
     """
     try:
+        # Imported on first use: it is the only tool module that pulls in the requests stack.
+        from utils.docker_utils import check_docker_image_architectures, check_docker_images_architectures
+
+        if isinstance(image, list):
+            return check_docker_images_architectures(image)
         return check_docker_image_architectures(image)
     except Exception as e:
         return format_tool_error(
@@ -105,17 +250,8 @@ def check_image(image: str, invocation_reason: Optional[str] = None) -> dict:
         )
 
 
-@mcp.tool(
-    description="Provides instructions for installing and using sysreport, a tool that obtains system information related to system architecture, CPU, memory, and other hardware details. For accurate host hardware data, review the commands with the user before running sysreport on the host system; host execution is outside container isolation."
-)
-def sysreport_instructions(invocation_reason: Optional[str] = None) -> Dict[str, Any]:
-    log_invocation_reason(
-        tool="sysreport_instructions",
-        reason=invocation_reason,
-        args={},
-    )
-    try:
-        instructions = """
+# sysreport runs on the user's host, so the tool only returns static instructions; build them once.
+SYSREPORT_INSTRUCTIONS = """
 # SysReport Installation and Usage
 
 ## Installation
@@ -137,12 +273,25 @@ python3 sysreport.py
 ## Note
 Run these commands directly on your host system (not in a container) to get accurate system information.
 """
-        return {
-            "instructions": instructions,
-            "repository": "https://github.com/ArmDeveloperEcosystem/sysreport.git",
-            "usage_command": "python3 sysreport.py",
-            "note": "This tool must be run on the host system to provide accurate system information."
-        }
+SYSREPORT_RESPONSE = {
+    "instructions": SYSREPORT_INSTRUCTIONS,
+    "repository": "https://github.com/ArmDeveloperEcosystem/sysreport.git",
+    "usage_command": "python3 sysreport.py",
+    "note": "This tool must be run on the host system to provide accurate system information."
+}
+
+
+@mcp.tool(
+    description="Provides instructions for installing and using sysreport, a tool that obtains system information related to system architecture, CPU, memory, and other hardware details. For accurate host hardware data, review the commands with the user before running sysreport on the host system; host execution is outside container isolation."
+)
+def sysreport_instructions(invocation_reason: Optional[str] = None) -> Dict[str, Any]:
+    log_invocation_reason(
+        tool="sysreport_instructions",
+        reason=invocation_reason,
+        args={},
+    )
+    try:
+        return dict(SYSREPORT_RESPONSE)
     except Exception as e:
         return format_tool_error(
             tool="sysreport_instructions",
@@ -199,7 +348,7 @@ def migrate_ease_scan(
         if scanner.lower() not in SUPPORTED_SCANNERS:
             return {
                 "status": "error",
-                "message": f"Unsupported scanner '{scanner}'. Supported: {sorted(SUPPORTED_SCANNERS)}"
+                "message": f"Unsupported scanner '{scanner}'. Supported: {SUPPORTED_SCANNERS_SORTED}"
             }
 
         return run_migrate_ease_scan(
@@ -222,8 +371,46 @@ def migrate_ease_scan(
             },
         )
 
+
+@mcp.tool(
+    description=(
+        "Run migrate-ease scans for several languages against the same target in parallel, e.g. "
+        "scanners=['cpp', 'python', 'go'] for a mixed-language codebase. Prefer this over calling "
+        "migrate_ease_scan once per scanner. Accepts the same arch, git_repo, output_format and extra_args "
+        "as migrate_ease_scan and returns a dictionary keyed by scanner, each value shaped like a "
+        "migrate_ease_scan result. Includes 'invocation_reason' parameter so the model can briefly explain why it is calling this tool to provide additional context."
+    )
+)
+def migrate_ease_scan_multi(
+    scanners: List[str],
+    arch: str = DEFAULT_ARCH,
+    git_repo: Optional[str] = None,
+    output_format: str = "json",
+    extra_args: Optional[List[str]] = None,
+    invocation_reason: Optional[str] = None,
+) -> Dict[str, Any]:
+    args = {
+        "scanners": scanners,
+        "arch": arch,
+        "git_repo": git_repo,
+        "output_format": output_format,
+        "extra_args": extra_args,
+    }
+    log_invocation_reason(tool="migrate_ease_scan_multi", reason=invocation_reason, args=args)
+    try:
+        return run_migrate_ease_scans(
+            scanners=scanners,
+            arch=arch,
+            git_repo=git_repo,
+            output_format=output_format,
+            extra_args=extra_args,
+        )
+    except Exception as e:
+        return format_tool_error(tool="migrate_ease_scan_multi", exc=e, args=args)
+
+
 @mcp.tool()
-def apx_recipe_run(cmd:str, remote_ip_addr:str, remote_usr:str, recipe:str="code_hotspots", invocation_reason: Optional[str] = None) -> Dict[str, Any]:
+async def apx_recipe_run(cmd:str, remote_ip_addr:str, remote_usr:str, recipe:str="code_hotspots", invocation_reason: Optional[str] = None) -> Dict[str, Any]:
     """
     Run a sample workload on the given target using a Performix recipe, 
     and interpret the results. Some example user requests: 
@@ -261,6 +448,12 @@ def apx_recipe_run(cmd:str, remote_ip_addr:str, remote_usr:str, recipe:str="code
             "recipe": recipe,
         },
     )
+    # The APX CLI steps block on SSH and workload runs that can take hours, and each step needs
+    # the previous step's ID, so run the chain on its own thread without holding the event loop.
+    return await asyncio.to_thread(_run_apx_recipe, cmd, remote_ip_addr, remote_usr, recipe)
+
+
+def _run_apx_recipe(cmd: str, remote_ip_addr: str, remote_usr: str, recipe: str) -> Dict[str, Any]:
     apx_dir = os.environ.get("APX_HOME", "/opt/apx")
     include_debug_trace = os.getenv("APX_DEBUG_TRACE", "").strip().lower() in {"1", "true", "yes", "on"}
     ssh_mount_env = resolve_apx_ssh_mount_env()
@@ -369,4 +562,8 @@ def mca(input_path: Optional[str] = None, triple: Optional[str] = None, cpu: Opt
 
 
 if __name__ == "__main__":
+    if PRELOAD_SEARCH_RESOURCES:
+        # Off the startup path, so the MCP handshake is not delayed; a search that arrives
+        # before loading finishes waits on the same lock instead of loading twice.
+        threading.Thread(target=_get_search_resources, name="search-preload", daemon=True).start()
     mcp.run(transport="stdio")
@@ -0,0 +1,88 @@
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from arm_kb_search.batching import BatchedEmbeddingModel
+from arm_kb_search.embedding_cache import DiskEmbeddingCache
+from arm_kb_search.search import clear_query_embedding_cache, encode_queries, encode_query
+
+
+class RecordingModel:
+    """Stand-in embedding model that records each encode call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, sentences, **kwargs):
+        self.calls.append((list(sentences), kwargs))
+        return np.array([[len(sentence), 1.0] for sentence in sentences], dtype=np.float32)
+
+
+def test_concurrent_query_encodes_are_coalesced_into_one_batch():
+    model = RecordingModel()
+    batched = BatchedEmbeddingModel(model, window_ms=200)
+    queries = ["neon", "sve2 gather", "graviton tuning", "sme outer product"]
+    start = threading.Barrier(len(queries))
+    embeddings = {}
+
+    def run(query):
+        start.wait()
+        embeddings[query] = encode_query(query, batched)
+
+    threads = [threading.Thread(target=run, args=(query,)) for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(model.calls) == 1
+    assert sorted(model.calls[0][0]) == sorted(queries)
+    for query in queries:
+        expected = np.array([len(query), 1.0], dtype=np.float32)
+        np.testing.assert_allclose(embeddings[query], expected / np.linalg.norm(expected))
+
+
+def test_identical_concurrent_queries_are_encoded_once():
+    model = RecordingModel()
+    batched = BatchedEmbeddingModel(model, window_ms=200)
+    start = threading.Barrier(3)
+    embeddings = []
+
+    def run():
+        start.wait()
+        embeddings.append(batched.encode(["neon"]))
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert model.calls == [(["neon"], {})]
+    assert len(embeddings) == 3
+    for embedding in embeddings:
+        np.testing.assert_array_equal(embedding, [[4.0, 1.0]])
+
+
+def test_encode_with_keyword_arguments_bypasses_the_batcher():
+    model = RecordingModel()
+    batched = BatchedEmbeddingModel(model, window_ms=200)
+
+    batched.encode(["neon"], convert_to_numpy=True)
+
+    assert model.calls == [(["neon"], {"convert_to_numpy": True})]
+
+
+def test_batch_and_single_encodes_share_the_query_embedding_memo(tmp_path):
+    clear_query_embedding_cache()
+    model = RecordingModel()
+    disk_cache = DiskEmbeddingCache(str(tmp_path / "cache.db"), "test")
+
+    single = encode_query("neon intrinsics", model, disk_cache)
+    batch = encode_queries(["neon intrinsics", "sve2"], model, disk_cache)
+
+    np.testing.assert_array_equal(batch[0], single)
+    assert model.calls == [(["neon intrinsics"], {}), (["sve2"], {})]
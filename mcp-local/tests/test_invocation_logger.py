@@ -17,6 +17,7 @@ def test_logs_paired_call_and_result(tmp_path, monkeypatch):
     )
     result = [{"title": "SME guide", "score": 0.9}]
     invocation_logger.log_tool_result(entry_id, "knowledge_base_search", result)
+    assert invocation_logger.flush_invocation_log(timeout=5)
 
     entries = [json.loads(line) for line in traffic_path.read_text().splitlines()]
     assert entries == [
@@ -45,7 +46,24 @@ def test_logs_call_without_invocation_reason(tmp_path, monkeypatch):
         reason=None,
         args={"query": "SVE2"},
     )
+    assert invocation_logger.flush_invocation_log(timeout=5)
 
     entry = json.loads(traffic_path.read_text())
     assert entry["id"] == entry_id
     assert entry["invocation_reason"] is None
+
+
+def test_logs_values_orjson_cannot_serialize(tmp_path, monkeypatch):
+    traffic_path = tmp_path / "mcp-traffic.jsonl"
+    monkeypatch.setattr(invocation_logger, "WORKSPACE_DIR", str(tmp_path))
+
+    entry_id = invocation_logger.log_invocation_reason(
+        tool="llvm_mca_analyze",
+        reason="Check cycle counts",
+        args={"iterations": 2**70},
+    )
+    assert invocation_logger.flush_invocation_log(timeout=5)
+
+    entry = json.loads(traffic_path.read_text())
+    assert entry["id"] == entry_id
+    assert entry["args"] == {"iterations": 2**70}
@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils import migrate_ease_utils
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    source = tmp_path / "workspace"
+    (source / "src").mkdir(parents=True)
+    (source / "src" / "main.c").write_text("int main(void) { return 0; }\n")
+    (source / "node_modules").mkdir()
+    monkeypatch.setattr(migrate_ease_utils, "WORKSPACE_DIR", str(source))
+    monkeypatch.setattr(migrate_ease_utils, "_scan_cache", migrate_ease_utils.OrderedDict())
+    return source
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Replace the migrate-ease subprocess with one that records the directory it scans."""
+    scanned = []
+
+    def fake_run(cmd, **kwargs):
+        scanned.append((cmd[0], cmd[-1], sorted(Path(cmd[-1]).rglob("*"))))
+        return subprocess.CompletedProcess(cmd, 0, stdout="ok", stderr="")
+
+    monkeypatch.setattr(migrate_ease_utils.subprocess, "run", fake_run)
+    return scanned
+
+
+def test_scans_share_one_filtered_workspace_copy(workspace, scans, monkeypatch):
+    copies = []
+    create = migrate_ease_utils._create_filtered_workspace
+    monkeypatch.setattr(
+        migrate_ease_utils, "_create_filtered_workspace", lambda source: copies.append(source) or create(source)
+    )
+
+    results = migrate_ease_utils.run_migrate_ease_scans(["cpp", "Python", "go"], "armv8-a", None, "txt")
+
+    assert copies == [str(workspace)]
+    assert sorted(results) == ["cpp", "go", "python"]
+    assert len({directory for _, directory, _ in scans}) == 1
+    assert all(result["excluded_items"] == ["node_modules"] for result in results.values())
+    # The shared copy is removed once every scan has finished.
+    assert not Path(scans[0][1]).exists()
+
+
+def test_unchanged_workspace_is_served_from_cache(workspace, scans):
+    first = migrate_ease_utils.run_migrate_ease_scan("cpp", "armv8-a", None, "txt")
+    second = migrate_ease_utils.run_migrate_ease_scans(["cpp"], "armv8-a", None, "txt")["cpp"]
+
+    assert len(scans) == 1
+    assert "cached" not in first
+    assert second["cached"] is True
+
+    (workspace / "src" / "util.c").write_text("void util(void) {}\n")
+    migrate_ease_utils.run_migrate_ease_scan("cpp", "armv8-a", None, "txt")
+
+    assert len(scans) == 2
+
+
+def test_failed_scans_are_not_cached(workspace, monkeypatch):
+    calls = []
+
+    def failing_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="boom")
+
+    monkeypatch.setattr(migrate_ease_utils.subprocess, "run", failing_run)
+
+    for _ in range(2):
+        assert migrate_ease_utils.run_migrate_ease_scan("cpp", "armv8-a", None, "txt")["status"] == "error"
+
+    assert len(calls) == 2
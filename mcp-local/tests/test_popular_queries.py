@@ -0,0 +1,28 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from arm_kb_search.loaders import load_popular_queries
+
+
+def test_loads_results_keyed_by_normalized_query(tmp_path):
+    path = tmp_path / "popular_queries.json"
+    results = [{"url": "https://learn.arm.com/neon", "title": "Neon"}]
+    path.write_text(json.dumps({"  What is  NEON ": results, "   ": results}))
+
+    assert load_popular_queries(str(path)) == {"what is neon": results}
+
+
+def test_missing_file_is_optional(tmp_path):
+    assert load_popular_queries(str(tmp_path / "absent.json")) == {}
+    assert load_popular_queries(None) == {}
+
+
+def test_malformed_shapes_are_reported_and_ignored(tmp_path, capsys):
+    path = tmp_path / "popular_queries.json"
+    for payload in ([{"query": "neon"}], {"neon": "https://learn.arm.com"}, {"neon": ["https://learn.arm.com"]}):
+        path.write_text(json.dumps(payload))
+
+        assert load_popular_queries(str(path)) == {}
+        assert "Error: Popular queries" in capsys.readouterr().err
@@ -0,0 +1,112 @@
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from arm_kb_search.embedding_cache import DiskEmbeddingCache
+from arm_kb_search.loaders import load_bm25_index, save_bm25_index
+from arm_kb_search.search import build_bm25_index
+from arm_kb_search.semantic_cache import SemanticResultCache
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskEmbeddingCache(str(tmp_path / "cache.db"), "model", max_entries=2, dtype="float32")
+    cache.put("neon", unit(1, 0))
+    cache.put("sve", unit(0, 1))
+    assert cache.get("neon") is not None
+
+    cache.put("sme", unit(1, 1))
+
+    assert cache.get("sve") is None
+    np.testing.assert_array_equal(cache.get("neon"), unit(1, 0))
+    np.testing.assert_array_equal(cache.get("sme"), unit(1, 1))
+
+
+def test_disk_cache_int8_round_trip_restores_unit_vectors(tmp_path):
+    cache = DiskEmbeddingCache(str(tmp_path / "cache.db"), "model", dtype="int8")
+    embedding = unit(0.3, -0.5, 0.8, 0.1)
+
+    cache.put("neon", embedding)
+    restored = cache.get("neon")
+
+    assert restored.dtype == np.float32
+    assert np.isclose(np.linalg.norm(restored), 1.0)
+    np.testing.assert_allclose(restored, embedding, atol=1e-2)
+
+
+def test_disk_cache_namespaces_do_not_share_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    DiskEmbeddingCache(path, "model-a").put("neon", unit(1, 0))
+
+    assert DiskEmbeddingCache(path, "model-b").get("neon") is None
+
+
+def test_semantic_cache_serves_near_duplicate_queries():
+    cache = SemanticResultCache(ndim=2, threshold=0.99)
+    results = [{"url": "https://learn.arm.com/neon"}]
+    cache.put(unit(1, 0), 5, results)
+
+    assert cache.get(unit(1, 0.01), 5) == results
+    assert cache.get(unit(0, 1), 5) is None
+    # Results for a different k are not interchangeable.
+    assert cache.get(unit(1, 0), 3) is None
+
+
+def test_semantic_cache_threshold_is_exact_for_near_threshold_pairs():
+    threshold = 0.995
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        cache = SemanticResultCache(ndim=384, threshold=threshold)
+        cached = unit(*rng.normal(size=384))
+        orthogonal = rng.normal(size=384).astype(np.float32)
+        orthogonal -= orthogonal.dot(cached) * cached
+        orthogonal /= np.linalg.norm(orthogonal)
+        cache.put(cached, 5, [{"url": "a"}])
+
+        for similarity, expected in ((threshold - 1e-5, None), (threshold + 1e-5, [{"url": "a"}])):
+            query = similarity * cached + np.sqrt(1 - similarity**2) * orthogonal
+            assert cache.get(query.astype(np.float32), 5) == expected
+
+
+def test_semantic_cache_returns_copies():
+    cache = SemanticResultCache(ndim=2, threshold=0.99)
+    cache.put(unit(1, 0), 5, [{"url": "https://learn.arm.com/neon"}])
+
+    cache.get(unit(1, 0), 5)[0]["url"] = "changed"
+
+    assert cache.get(unit(1, 0), 5) == [{"url": "https://learn.arm.com/neon"}]
+
+
+def test_semantic_cache_evicts_oldest_and_clears():
+    cache = SemanticResultCache(ndim=2, threshold=0.99, max_entries=1)
+    cache.put(unit(1, 0), 5, [{"url": "a"}])
+    cache.put(unit(0, 1), 5, [{"url": "b"}])
+
+    assert cache.get(unit(1, 0), 5) is None
+    assert cache.get(unit(0, 1), 5) == [{"url": "b"}]
+
+    cache.clear()
+
+    assert cache.get(unit(0, 1), 5) is None
+
+
+def test_bm25_index_round_trips_and_rejects_stale_pickles(tmp_path, capsys):
+    metadata = [{"search_text": "neon intrinsics"}, {"search_text": "sve gather loads"}]
+    path = str(tmp_path / "bm25_index.pkl")
+    save_bm25_index(build_bm25_index(metadata), path)
+
+    assert load_bm25_index(path, metadata).corpus_size == 2
+    assert load_bm25_index(path, metadata + [{"search_text": "sme"}]) is None
+    assert "does not match the metadata" in capsys.readouterr().err
+
+    with open(path, "wb") as file:
+        pickle.dump({"version": 0, "corpus_size": 2, "bm25": None}, file)
+
+    assert load_bm25_index(path, metadata) is None
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from usearch.index import Index
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from arm_kb_search.loaders import load_usearch_index, map_usearch_index
+from arm_kb_search.resources import SearchResources, search
+from arm_kb_search.search import clear_query_embedding_cache, deduplicate_urls, hybrid_search
+
+
+class ConstantModel:
+    """Stand-in embedding model that maps every query to the same unit vector."""
+
+    def encode(self, sentences):
+        return np.tile(np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32), (len(sentences), 1))
+
+
+def make_resources(k):
+    urls = [
+        "https://learn.arm.com/a",
+        "https://learn.arm.com/b",
+        None,
+        "https://learn.arm.com/a",
+        "https://learn.arm.com/c",
+        None,
+        "https://learn.arm.com/b",
+    ]
+    metadata = [
+        {"chunk_uuid": f"chunk-{row}", "url": url, "title": f"Chunk {row}", "original_text": f"text {row}"}
+        for row, url in enumerate(urls)
+    ]
+    rng = np.random.default_rng(0)
+    vectors = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32) + rng.normal(0, 0.1, (len(urls), 4))
+    vectors = vectors.astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = Index(ndim=4, metric="cos")
+    index.add(np.arange(len(urls)), vectors)
+    return SearchResources(
+        metadata=metadata,
+        embedding_model=ConstantModel(),
+        usearch_index=index,
+        bm25_index=None,
+        default_k=k,
+        include_disclaimers=False,
+    )
+
+
+def test_search_keeps_the_best_ranked_chunk_per_url():
+    clear_query_embedding_cache()
+    resources = make_resources(k=5)
+
+    results = search("vector extensions", resources)
+
+    expected = deduplicate_urls(
+        hybrid_search(
+            "vector extensions",
+            resources.usearch_index,
+            resources.metadata,
+            resources.embedding_model,
+            None,
+            k=100,
+        )
+    )
+    assert [result["url"] for result in results] == [item["metadata"]["url"] for item in expected]
+    assert sorted(result["url"] for result in results) == [
+        "https://learn.arm.com/a",
+        "https://learn.arm.com/b",
+        "https://learn.arm.com/c",
+    ]
+    assert [result["title"] for result in results] == [item["metadata"]["title"] for item in expected]
+
+
+def test_search_stops_at_k_unique_urls():
+    clear_query_embedding_cache()
+    resources = make_resources(k=2)
+
+    results = search("vector extensions", resources)
+
+    assert len(results) == 2
+    assert len({result["url"] for result in results}) == 2
+    assert None not in [result["url"] for result in results]
+
+
+def test_madvise_random_index_views_a_mapping_the_caller_owns(tmp_path, monkeypatch):
+    monkeypatch.setenv("USEARCH_MADV_RANDOM", "1")
+    path = str(tmp_path / "usearch_index.bin")
+    make_resources(k=5).usearch_index.save(path)
+
+    mapping = map_usearch_index(path)
+    if mapping is None:
+        pytest.skip("madvise(MADV_RANDOM) is not available on this platform")
+    index = load_usearch_index(path, 4, mapped_file=mapping)
+
+    assert index.search(np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32), 3).keys.tolist()
+    monkeypatch.setenv("USEARCH_MADV_RANDOM", "0")
+    assert map_usearch_index(path) is None
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils import cli_utils, docker_utils
+
+
+def test_help_output_is_cached_but_failures_are_not(monkeypatch):
+    monkeypatch.setattr(cli_utils, "_help_cache", {})
+    calls = []
+
+    def fake_run_command(cmd):
+        calls.append(cmd)
+        status = "ok" if cmd[0] == "llvm-mca" else "error"
+        return {"status": status, "code": 0, "stdout": "usage", "stderr": "", "cmd": cmd}
+
+    monkeypatch.setattr(cli_utils, "run_command", fake_run_command)
+
+    first = cli_utils.run_help_command(["llvm-mca", "--help"])
+    first["stdout"] = "changed"
+    second = cli_utils.run_help_command(["llvm-mca", "--help"])
+    cli_utils.run_help_command(["skopeo", "--help"])
+    cli_utils.run_help_command(["skopeo", "--help"])
+
+    assert second["stdout"] == "usage"
+    assert calls == [["llvm-mca", "--help"], ["skopeo", "--help"], ["skopeo", "--help"]]
+
+
+def test_image_checks_are_cached_until_the_ttl_expires(monkeypatch):
+    monkeypatch.setattr(docker_utils, "_image_check_cache", docker_utils.OrderedDict())
+    clock = [1000.0]
+    monkeypatch.setattr(docker_utils.time, "monotonic", lambda: clock[0])
+    checks = []
+
+    def fake_check(image):
+        checks.append(image)
+        return {"status": "success", "architectures": ["amd64", "arm64"]}
+
+    monkeypatch.setattr(docker_utils, "_check_docker_image_architectures_uncached", fake_check)
+
+    docker_utils.check_docker_image_architectures("nginx:latest")
+    docker_utils.check_docker_image_architectures("nginx:latest")["architectures"].append("changed")
+    assert docker_utils.check_docker_image_architectures("nginx:latest")["architectures"] == ["amd64", "arm64"]
+    assert checks == ["nginx:latest"]
+
+    clock[0] += docker_utils.IMAGE_CHECK_CACHE_TTL_SECONDS + 1
+    docker_utils.check_docker_image_architectures("nginx:latest")
+
+    assert checks == ["nginx:latest", "nginx:latest"]
+
+
+def test_image_check_errors_are_not_cached(monkeypatch):
+    monkeypatch.setattr(docker_utils, "_image_check_cache", docker_utils.OrderedDict())
+    checks = []
+
+    def failing_check(image):
+        checks.append(image)
+        return {"status": "error", "message": "Failed to get auth token: 429 Too Many Requests"}
+
+    monkeypatch.setattr(docker_utils, "_check_docker_image_architectures_uncached", failing_check)
+
+    docker_utils.check_docker_image_architectures("nginx:latest")
+    docker_utils.check_docker_image_architectures("nginx:latest")
+
+    assert checks == ["nginx:latest", "nginx:latest"]
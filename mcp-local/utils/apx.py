@@ -832,6 +832,7 @@ def get_results(run_id: dict, recipe: str, apx_dir: str, default_table: str = "d
             cwd=apx_dir,
             capture_output=True,
             text=True,
+            timeout=60 * 5,
         )
     except subprocess.TimeoutExpired:
         return _build_atp_error_response(
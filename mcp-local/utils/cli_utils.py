@@ -14,11 +14,15 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import copy
 import subprocess
 import shlex
 import os
 
+# Successful help output per command; it cannot change while the installed binary stays the same.
+_help_cache: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
 
 def run_command(cmd: List[str], use_venv: bool = False, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """Run a CLI command and return a structured result.
@@ -64,3 +68,15 @@ def run_command(cmd: List[str], use_venv: bool = False, cwd: Optional[str] = Non
     except Exception as e:
         return {"status": "error", "code": -1, "stdout": "", "stderr": str(e), "cmd": cmd}
 
+
+def run_help_command(cmd: List[str]) -> Dict[str, Any]:
+    """Like run_command, but spawn each help command only once per process."""
+    key = tuple(cmd)
+    cached = _help_cache.get(key)
+    if cached is None:
+        result = run_command(cmd)
+        if result["status"] != "ok":
+            # Do not pin failures (e.g. a binary installed after startup).
+            return result
+        cached = _help_cache.setdefault(key, result)
+    return copy.deepcopy(cached)
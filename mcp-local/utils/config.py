@@ -21,16 +21,49 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), "data")
 USEARCH_INDEX_PATH = os.path.join(DATA_DIR, "usearch_index.bin")
 METADATA_PATH = os.path.join(DATA_DIR, "metadata.json")
-MODEL_NAME = 'all-MiniLM-L6-v2'
+# Coalesce concurrent query encodes arriving within this many milliseconds; 0 disables batching.
+ENCODE_BATCH_WINDOW_MS = float(os.getenv("ENCODE_BATCH_WINDOW_MS", "0"))
+# Prebuilt at image build time; rebuilt in memory if missing or stale.
+BM25_INDEX_PATH = os.path.join(DATA_DIR, "bm25_index.pkl")
+# Must match the model the embeddings image was built with (see the EMBEDDING_MODEL build arg).
+MODEL_NAME = os.getenv("SENTENCE_TRANSFORMER_MODEL", 'all-MiniLM-L6-v2')
+# Load and warm the search resources on a background thread at startup, so the first
+# knowledge_base_search does not pay for it. This loads the embedding model (and its memory)
+# in every session, even ones that never search; set to 0 to load them on first use instead.
+PRELOAD_SEARCH_RESOURCES = os.getenv("PRELOAD_SEARCH_RESOURCES", "1").strip().lower() in {"1", "true", "yes", "on"}
+# Run a throwaway encode and index search once the search resources load, so the first real
+# query does not pay lazy initialization; set MCP_WARMUP=0 to skip it.
+WARM_UP_SEARCH_RESOURCES = os.getenv("MCP_WARMUP", "1").strip().lower() in {"1", "true", "yes", "on"}
+# Persist query embeddings across restarts. Off unless set: the container filesystem is discarded
+# with each `docker run --rm`, so point this at a mounted volume (see "Query embedding cache" in the README).
+QUERY_EMBEDDING_CACHE_PATH = os.getenv("QUERY_EMBEDDING_CACHE_PATH", "")
+# Reuse results of a recent query whose embedding has at least this cosine similarity; 0 disables.
+# Off by default: near-identical queries can still differ in a version or product name.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0"))
+# Longer queries are cut before normalizing; the model only reads its first ~256 tokens anyway.
+MAX_QUERY_CHARS = 2048
+# Optional JSON object mapping query -> list of prebaked result objects, regenerated offline from
+# invocation logs. Keys are lowercased and whitespace-collapsed on load; a malformed file is ignored.
+POPULAR_QUERIES_PATH = os.getenv("POPULAR_QUERIES_PATH", os.path.join(DATA_DIR, "popular_queries.json"))
 
 # Docker architecture checking configuration
 TARGET_ARCHITECTURES = {'amd64', 'arm64'}
 TIMEOUT_SECONDS = 10
+# Image manifests rarely change within minutes; reuse successful checks for this long.
+IMAGE_CHECK_CACHE_TTL_SECONDS = 600
+IMAGE_CHECK_CACHE_SIZE = 512
+# Registry lookups are network-bound, so several images are checked concurrently.
+IMAGE_CHECK_MAX_WORKERS = 8
 
 # migrate-ease configuration
 MIGRATE_EASE_ROOT = "/app/migrate-ease"
 # Migrate-Ease scanners supported by this package. Five language wrappers are
 # installed: cpp, python, go, js, java.
-SUPPORTED_SCANNERS = {"cpp", "python", "go", "js", "java"}
+SUPPORTED_SCANNERS = frozenset({"cpp", "python", "go", "js", "java"})
+SUPPORTED_SCANNERS_SORTED = sorted(SUPPORTED_SCANNERS)
 DEFAULT_ARCH = "armv8-a"
+# Successful local scans are reused while the workspace files are unchanged.
+MIGRATE_EASE_CACHE_SIZE = 16
 WORKSPACE_DIR = "/workspace"
+# Append tool calls and results to the workspace traffic log; set MCP_LOG_INVOCATIONS=0 to disable.
+LOG_INVOCATIONS = os.getenv("MCP_LOG_INVOCATIONS", "1").strip().lower() in {"1", "true", "yes", "on"}
@@ -12,25 +12,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from typing import Dict, List, Tuple
+import threading
+import time
 import requests
-from .config import TARGET_ARCHITECTURES, TIMEOUT_SECONDS
+from requests.adapters import HTTPAdapter
+from .config import (
+    IMAGE_CHECK_CACHE_SIZE,
+    IMAGE_CHECK_CACHE_TTL_SECONDS,
+    IMAGE_CHECK_MAX_WORKERS,
+    TARGET_ARCHITECTURES,
+    TIMEOUT_SECONDS,
+)
+
+# Reuse TCP/TLS connections to auth.docker.io and the registry across lookups. Size the pool
+# so concurrent multi-image checks keep their connections alive instead of discarding them.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+# Docker Hub tokens are valid for a few minutes; refresh slightly before they expire.
+TOKEN_EXPIRY_MARGIN_SECONDS = 30
+DEFAULT_TOKEN_LIFETIME_SECONDS = 300
+_token_cache: Dict[str, Tuple[str, float]] = {}
+_token_cache_lock = threading.Lock()
+_image_check_cache: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+_image_check_cache_lock = threading.Lock()
 
 
 def get_auth_token(repository: str) -> str:
     """Get Docker Hub authentication token."""
+    with _token_cache_lock:
+        cached = _token_cache.get(repository)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
     url = "https://auth.docker.io/token"
     params = {
         "service": "registry.docker.io",
         "scope": f"repository:{repository}:pull"
     }
     try:
-        response = requests.get(url, params=params, timeout=TIMEOUT_SECONDS)
+        response = HTTP_SESSION.get(url, params=params, timeout=TIMEOUT_SECONDS)
         response.raise_for_status()
-        return response.json()['token']
+        payload = response.json()
     except requests.exceptions.RequestException as e:
         return f"Failed to get auth token: {e}"
 
+    token = payload['token']
+    lifetime = int(payload.get('expires_in') or DEFAULT_TOKEN_LIFETIME_SECONDS)
+    expires_at = time.monotonic() + max(0, lifetime - TOKEN_EXPIRY_MARGIN_SECONDS)
+    with _token_cache_lock:
+        _token_cache[repository] = (token, expires_at)
+    return token
+
 
 def get_manifest(repository: str, tag: str, token: str) -> Dict:
     """Fetch manifest for specified image."""
@@ -40,7 +76,7 @@ def get_manifest(repository: str, tag: str, token: str) -> Dict:
     }
     url = f"https://registry-1.docker.io/v2/{repository}/manifests/{tag}"
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT_SECONDS)
+        response = HTTP_SESSION.get(url, headers=headers, timeout=TIMEOUT_SECONDS)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -69,6 +105,35 @@ def parse_image_spec(image: str) -> Tuple[str, str]:
 
 
 def check_docker_image_architectures(image: str) -> dict:
+    """Check Docker image architectures, reusing recent results for the same image."""
+    now = time.monotonic()
+    with _image_check_cache_lock:
+        cached = _image_check_cache.get(image)
+        if cached is not None and cached[1] > now:
+            _image_check_cache.move_to_end(image)
+            return copy.deepcopy(cached[0])
+
+    result = _check_docker_image_architectures_uncached(image)
+    # Errors are often transient (rate limits, network), so only cache definitive answers.
+    if result.get("status") != "error":
+        with _image_check_cache_lock:
+            _image_check_cache[image] = (copy.deepcopy(result), now + IMAGE_CHECK_CACHE_TTL_SECONDS)
+            _image_check_cache.move_to_end(image)
+            while len(_image_check_cache) > IMAGE_CHECK_CACHE_SIZE:
+                _image_check_cache.popitem(last=False)
+    return result
+
+
+def check_docker_images_architectures(images: List[str]) -> Dict[str, dict]:
+    """Check several images concurrently; returns one result per distinct image."""
+    unique_images = list(dict.fromkeys(images))
+    if not unique_images:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(IMAGE_CHECK_MAX_WORKERS, len(unique_images))) as executor:
+        return dict(zip(unique_images, executor.map(check_docker_image_architectures, unique_images)))
+
+
+def _check_docker_image_architectures_uncached(image: str) -> dict:
     """Check Docker image architectures and return status information."""
     repository, tag = parse_image_spec(image)
     token = get_auth_token(repository)
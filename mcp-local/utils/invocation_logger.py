@@ -12,34 +12,121 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import json
 import os
+import queue
+import sys
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
-from .config import WORKSPACE_DIR
+import orjson
+
+from .config import LOG_INVOCATIONS, WORKSPACE_DIR
 
 
 LOG_FILE_NAME = "mcp-traffic.jsonl"
+# Entries are appended by a background writer so tool calls never wait on file I/O. It writes
+# up to LOG_BATCH_SIZE entries at a time, at most LOG_FLUSH_INTERVAL_SECONDS after the first.
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL_SECONDS = 0.1
+
+_log_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+_writer_lock = threading.Lock()
+_writer_thread: Optional[threading.Thread] = None
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _write_batch(batch: List[Tuple[str, bytes]]) -> None:
+    lines_by_path: Dict[str, List[bytes]] = {}
+    for log_path, line in batch:
+        lines_by_path.setdefault(log_path, []).append(line)
+    for log_path, lines in lines_by_path.items():
+        try:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            with open(log_path, "ab") as f:
+                f.write(b"".join(lines))
+        except Exception:
+            pass
+
+
+def _writer_loop() -> None:
+    while True:
+        item = _log_queue.get()
+        batch: List[Tuple[str, bytes]] = []
+        flush_requests: List[threading.Event] = []
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL_SECONDS
+        while True:
+            if isinstance(item, threading.Event):
+                flush_requests.append(item)
+            else:
+                batch.append(item)
+            remaining = deadline - time.monotonic()
+            # A flush request is queued after the entries it covers, so they are all in the batch.
+            if flush_requests or len(batch) >= LOG_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                item = _log_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        _write_batch(batch)
+        for flush_request in flush_requests:
+            flush_request.set()
+
+
+def _enqueue(entry: Dict[str, Any]) -> None:
+    global _writer_thread
+    try:
+        # Serialize now: callers may reuse or mutate the logged objects after returning.
+        line = orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    except Exception:
+        # orjson rejects some values json accepts (e.g. integers wider than 64 bits).
+        try:
+            line = (json.dumps(entry, default=str) + "\n").encode("utf-8")
+        except Exception as e:
+            print(f"Error: Could not serialize traffic log entry for '{entry.get('tool')}': {e}", file=sys.stderr)
+            return
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_writer_loop, name="invocation-log-writer", daemon=True)
+                _writer_thread.start()
+    _log_queue.put((os.path.join(WORKSPACE_DIR, LOG_FILE_NAME), line))
+
+
+def flush_invocation_log(timeout: Optional[float] = None) -> bool:
+    """Block until every entry logged so far is on disk; returns False on timeout."""
+    if _writer_thread is None:
+        return True
+    flushed = threading.Event()
+    _log_queue.put(flushed)
+    return flushed.wait(timeout)
+
+
+# The writer is a daemon thread; give it a moment to drain the queue at interpreter exit.
+atexit.register(flush_invocation_log, 2.0)
+
+
 def log_invocation_reason(
     tool: str,
     reason: Optional[str],
     args: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
-    Append a JSONL call entry to the workspace traffic log.
+    Queue a JSONL call entry for the workspace traffic log.
 
     Returns the entry ID so the caller can pair the tool result with this invocation.
     Errors are swallowed to avoid impacting tool execution.
     """
     entry_id = str(uuid.uuid4())
+    if not LOG_INVOCATIONS:
+        return entry_id
     timestamp = _now_iso()
 
     traffic_entry = {
@@ -49,29 +136,19 @@ def log_invocation_reason(
         "args": args or {},
         "invocation_reason": reason,
     }
-    log_path = os.path.join(WORKSPACE_DIR, LOG_FILE_NAME)
-    try:
-        os.makedirs(WORKSPACE_DIR, exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(traffic_entry) + "\n")
-    except Exception:
-        pass
+    _enqueue(traffic_entry)
 
     return entry_id
 
 
 def log_tool_result(entry_id: str, tool: str, result: Any) -> None:
-    """Append a JSONL result entry paired with a tool invocation."""
-    log_path = os.path.join(WORKSPACE_DIR, LOG_FILE_NAME)
+    """Queue a JSONL result entry paired with a tool invocation."""
+    if not LOG_INVOCATIONS:
+        return
     result_entry = {
         "id": entry_id,
         "type": "result",
         "tool": tool,
         "result": result,
     }
-    try:
-        os.makedirs(WORKSPACE_DIR, exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(result_entry, default=str) + "\n")
-    except Exception:
-        pass
+    _enqueue(result_entry)
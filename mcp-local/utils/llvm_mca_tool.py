@@ -13,11 +13,11 @@
 # limitations under the License.
 
 from typing import Dict, Any, List, Optional
-from .cli_utils import run_command
+from .cli_utils import run_command, run_help_command
 
 
 def mca_help() -> Dict[str, Any]:
-    return run_command(["llvm-mca", "--help"])
+    return run_help_command(["llvm-mca", "--help"])
 
 
 def llvm_mca_analyze(input_path: str, triple: Optional[str], cpu: Optional[str], extra_args: Optional[List[str]]) -> Dict[str, Any]:
@@ -12,15 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Any, List, Optional, Set
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
+import copy
+import hashlib
 import os
+import threading
 import time
 import shlex
 import subprocess
-import json
 import tempfile
 import shutil
-from .config import SUPPORTED_SCANNERS, WORKSPACE_DIR
+import orjson
+from .config import MIGRATE_EASE_CACHE_SIZE, SUPPORTED_SCANNERS, SUPPORTED_SCANNERS_SORTED, WORKSPACE_DIR
 
 # Directories and patterns to exclude from migrate-ease scans
 EXCLUDE_PATTERNS: Set[str] = {
@@ -39,6 +44,9 @@ EXCLUDE_PATTERNS: Set[str] = {
     'target', 'out', '.cache',
 }
 
+_scan_cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_scan_cache_lock = threading.Lock()
+
 
 def _normalize_scanner(scanner: str) -> str:
     """
@@ -144,6 +152,26 @@ def _create_filtered_workspace(source_dir: str) -> tuple[str, List[str]]:
     return filtered_dir, excluded_items
 
 
+def _workspace_fingerprint(source_dir: str) -> Optional[str]:
+    """Hash the path, size and mtime of every file a filtered scan would copy."""
+    digest = hashlib.blake2b(digest_size=16)
+    file_count = 0
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if not _should_exclude(d))
+        for name in sorted(files):
+            if _should_exclude(name):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(path, source_dir)}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+            file_count += 1
+    # An empty or unreadable workspace usually means a bad mount; never serve it from cache.
+    return digest.hexdigest() if file_count else None
+
+
 def _build_output_path(scanner: str, output_format: str) -> str:
     ts = time.strftime("%Y%m%d-%H%M%S")
     suffix = output_format.lower().lstrip(".")
@@ -151,39 +179,58 @@ def _build_output_path(scanner: str, output_format: str) -> str:
     return f"/tmp/migrate_ease_{scanner}_{ts}.{suffix}"
 
 
-def run_migrate_ease_scan(
-    scanner: str,
-    arch: str,
-    git_repo: Optional[str],
-    output_format: str,
-    extra_args: Optional[List[str]] = None,
-) -> Dict[str, Any]:
+def _scan_cache_key(
+    scanner: str, arch: str, fmt: str, extra_args: Optional[List[str]], fingerprint: Optional[str]
+) -> Optional[Tuple[Any, ...]]:
+    if fingerprint is None:
+        return None
+    return (scanner, arch, fmt, tuple(extra_args or ()), fingerprint)
+
+
+def _get_cached_scan(cache_key: Optional[Tuple[Any, ...]]) -> Optional[Dict[str, Any]]:
+    if cache_key is None:
+        return None
+    with _scan_cache_lock:
+        cached = _scan_cache.get(cache_key)
+        if cached is None:
+            return None
+        _scan_cache.move_to_end(cache_key)
+        return {**copy.deepcopy(cached), "cached": True}
+
+
+def _create_scan_workspace() -> Tuple[Optional[str], Optional[List[str]], Optional[str]]:
     """
-    Execute migrate-ease via unified CLI wrappers installed in /usr/local/bin:
-    'migrate-ease-{scanner}' (e.g., migrate-ease-cpp, migrate-ease-python, migrate-ease-go, migrate-ease-js, migrate-ease-java).
+    Create the filtered copy of WORKSPACE_DIR that local scans run against.
 
-    NOTE: Local scans now use a filtered copy of WORKSPACE_DIR (/workspace) that excludes
-    virtual environments, dependency directories, and build artifacts to improve scan
-    performance and avoid errors from broken symlinks. Remote repository scans are staged
-    inside a temporary directory under /tmp that is removed after execution. The migrate-ease
-    output file is created under /tmp and is **deleted** before this function returns.
-    A best-effort deletion flag is included in the returned dictionary as 'output_file_deleted'.
-    For local scans, a listing of excluded items is included in the result.
+    Returns:
+        Tuple of (filtered_directory_path, list_of_excluded_items, error). If filtering fails,
+        the path and excluded items are None and scans fall back to the original workspace.
     """
-    normalized_scanner = _normalize_scanner(scanner)
-    fmt = output_format.lower().lstrip(".")
-    if fmt not in {"json", "txt", "csv", "html"}:
-        return {"status": "error", "message": f"Unsupported output format '{output_format}'."}
+    try:
+        filtered_dir, excluded_items = _create_filtered_workspace(WORKSPACE_DIR)
+        return filtered_dir, excluded_items, None
+    except Exception as e:
+        return None, None, f"Failed to create filtered workspace (scanning original): {e}"
 
-    out_path = _build_output_path(normalized_scanner, fmt)
+
+def _execute_scan(
+    scanner: str,
+    arch: str,
+    git_repo: Optional[str],
+    fmt: str,
+    extra_args: Optional[List[str]],
+    cache_key: Optional[Tuple[Any, ...]],
+    workspace: Tuple[Optional[str], Optional[List[str]], Optional[str]],
+) -> Dict[str, Any]:
+    """Run one migrate-ease scan; local scans read the prepared (shared, read-only) workspace."""
+    out_path = _build_output_path(scanner, fmt)
 
     # Base command uses unified wrapper
-    wrapper = f"migrate-ease-{normalized_scanner}"
+    wrapper = f"migrate-ease-{scanner}"
 
     cmd: List[str] = [wrapper, "--march", arch, "--output", out_path]
 
     temporary_clone_dir: Optional[str] = None
-    filtered_workspace_dir: Optional[str] = None
     workspace_listing: Optional[List[str]] = None
     workspace_listing_error: Optional[str] = None
     excluded_items: Optional[List[str]] = None
@@ -196,9 +243,8 @@ def run_migrate_ease_scan(
             cmd.extend(["--git-repo", git_repo, temporary_clone_dir])
             resolved_for_echo = temporary_clone_dir
         else:
-            # Create a filtered copy of the workspace to exclude venvs, node_modules, etc.
-            try:
-                filtered_workspace_dir, excluded_items = _create_filtered_workspace(WORKSPACE_DIR)
+            filtered_workspace_dir, excluded_items, workspace_listing_error = workspace
+            if filtered_workspace_dir:
                 cmd.append(filtered_workspace_dir)
                 resolved_for_echo = f"{WORKSPACE_DIR} (filtered)"
 
@@ -207,12 +253,11 @@ def run_migrate_ease_scan(
                     workspace_listing = sorted(os.listdir(filtered_workspace_dir))
                 except Exception as e:
                     workspace_listing_error = f"Failed to list filtered workspace contents: {e}"
-            except Exception as e:
-                # If filtering fails, fall back to scanning the original workspace
+            else:
+                # If filtering failed, fall back to scanning the original workspace
                 # but note the error
                 cmd.append(WORKSPACE_DIR)
                 resolved_for_echo = WORKSPACE_DIR
-                workspace_listing_error = f"Failed to create filtered workspace (scanning original): {e}"
                 try:
                     workspace_listing = sorted(os.listdir(WORKSPACE_DIR))
                 except Exception as e2:
@@ -247,14 +292,15 @@ def run_migrate_ease_scan(
         if workspace_listing_error:
             result["workspace_listing_error"] = workspace_listing_error
         if excluded_items is not None:
-            result["excluded_items"] = excluded_items
+            result["excluded_items"] = list(excluded_items)
             result["excluded_count"] = len(excluded_items)
 
         # Inline JSON results before cleanup so callers still get the data.
         if fmt == "json":
             try:
-                with open(out_path, "r") as f:
-                    data = json.load(f)
+                # Reports can run to several MB; orjson parses the raw bytes without a text decode pass.
+                with open(out_path, "rb") as f:
+                    data = orjson.loads(f.read())
                 result["parsed_results"] = data
             except Exception as e:
                 result["parsed_results_error"] = f"Failed to parse JSON report: {e}"
@@ -271,6 +317,12 @@ def run_migrate_ease_scan(
             result["output_file_deleted"] = False
             result["output_file_delete_error"] = f"Failed to delete output file: {e}"
 
+        if cache_key is not None and status == "success":
+            with _scan_cache_lock:
+                _scan_cache[cache_key] = copy.deepcopy(result)
+                _scan_cache.move_to_end(cache_key)
+                while len(_scan_cache) > MIGRATE_EASE_CACHE_SIZE:
+                    _scan_cache.popitem(last=False)
         return result
 
     except subprocess.TimeoutExpired:
@@ -286,8 +338,106 @@ def run_migrate_ease_scan(
             "hint": "Ensure migrate-ease wrappers are installed on PATH (e.g., /usr/local/bin).",
         }
     finally:
-        # Clean up temporary directories
+        # Clean up the temporary clone; the shared filtered workspace is removed by the caller
         if temporary_clone_dir:
             shutil.rmtree(temporary_clone_dir, ignore_errors=True)
-        if filtered_workspace_dir:
-            shutil.rmtree(filtered_workspace_dir, ignore_errors=True)
+
+
+def run_migrate_ease_scan(
+    scanner: str,
+    arch: str,
+    git_repo: Optional[str],
+    output_format: str,
+    extra_args: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Execute migrate-ease via unified CLI wrappers installed in /usr/local/bin:
+    'migrate-ease-{scanner}' (e.g., migrate-ease-cpp, migrate-ease-python, migrate-ease-go, migrate-ease-js, migrate-ease-java).
+
+    NOTE: Local scans now use a filtered copy of WORKSPACE_DIR (/workspace) that excludes
+    virtual environments, dependency directories, and build artifacts to improve scan
+    performance and avoid errors from broken symlinks. Remote repository scans are staged
+    inside a temporary directory under /tmp that is removed after execution. The migrate-ease
+    output file is created under /tmp and is **deleted** before this function returns.
+    A best-effort deletion flag is included in the returned dictionary as 'output_file_deleted'.
+    For local scans, a listing of excluded items is included in the result. Successful local scans
+    are cached per (scanner, arch, format, extra args, workspace fingerprint); hits carry 'cached': True.
+    """
+    normalized_scanner = _normalize_scanner(scanner)
+    fmt = output_format.lower().lstrip(".")
+    if fmt not in {"json", "txt", "csv", "html"}:
+        return {"status": "error", "message": f"Unsupported output format '{output_format}'."}
+
+    # Repeat scans of an unchanged workspace (retries, re-renders) reuse the previous result.
+    # Remote repositories can change without notice, so they are always rescanned.
+    if git_repo:
+        return _execute_scan(normalized_scanner, arch, git_repo, fmt, extra_args, None, (None, None, None))
+    cache_key = _scan_cache_key(normalized_scanner, arch, fmt, extra_args, _workspace_fingerprint(WORKSPACE_DIR))
+    cached = _get_cached_scan(cache_key)
+    if cached is not None:
+        return cached
+    workspace = _create_scan_workspace()
+    try:
+        return _execute_scan(normalized_scanner, arch, git_repo, fmt, extra_args, cache_key, workspace)
+    finally:
+        if workspace[0]:
+            shutil.rmtree(workspace[0], ignore_errors=True)
+
+
+def run_migrate_ease_scans(
+    scanners: List[str],
+    arch: str,
+    git_repo: Optional[str],
+    output_format: str,
+    extra_args: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run several scanners against the same target concurrently; returns results keyed by scanner.
+
+    Each scan is its own migrate-ease subprocess, so threads are enough to run them in parallel.
+    Local scans fingerprint the workspace and build its filtered copy once, shared by every scanner.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    supported: List[str] = []
+    for scanner in dict.fromkeys(_normalize_scanner(s) for s in scanners):
+        if scanner.lower() in SUPPORTED_SCANNERS:
+            supported.append(scanner)
+        else:
+            results[scanner] = {
+                "status": "error",
+                "message": f"Unsupported scanner '{scanner}'. Supported: {SUPPORTED_SCANNERS_SORTED}",
+            }
+    if not supported:
+        return results
+    fmt = output_format.lower().lstrip(".")
+    if fmt not in {"json", "txt", "csv", "html"}:
+        for scanner in supported:
+            results[scanner] = {"status": "error", "message": f"Unsupported output format '{output_format}'."}
+        return results
+
+    fingerprint = None if git_repo else _workspace_fingerprint(WORKSPACE_DIR)
+    cache_keys = {scanner: _scan_cache_key(scanner, arch, fmt, extra_args, fingerprint) for scanner in supported}
+    pending: List[str] = []
+    for scanner in supported:
+        cached = None if git_repo else _get_cached_scan(cache_keys[scanner])
+        if cached is None:
+            pending.append(scanner)
+        else:
+            results[scanner] = cached
+    if not pending:
+        return results
+
+    workspace = (None, None, None) if git_repo else _create_scan_workspace()
+    try:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            scans = executor.map(
+                lambda scanner: _execute_scan(
+                    scanner, arch, git_repo, fmt, extra_args, cache_keys[scanner], workspace
+                ),
+                pending,
+            )
+            results.update(zip(pending, scans))
+    finally:
+        if workspace[0]:
+            shutil.rmtree(workspace[0], ignore_errors=True)
+    return results
@@ -13,11 +13,11 @@
 # limitations under the License.
 
 from typing import Dict, Any
-from .cli_utils import run_command
+from .cli_utils import run_command, run_help_command
 
 
 def skopeo_help() -> Dict[str, Any]:
-    return run_command(["skopeo", "--help"])
+    return run_help_command(["skopeo", "--help"])
 
 
 def skopeo_inspect(image: str, transport: str = "docker", raw: bool = False) -> Dict[str, Any]: